@@ -2,6 +2,18 @@
 """
 Advent of Code 2025 - Day 4: Printing Department
 """
+import mmap
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the pure-Python engine still works
+    np = None
+
 
 def read_input(filename='input.txt'):
     """Read and return the input file."""
@@ -39,11 +51,128 @@ def count_adjacent_rolls(grid, row, col):
     return count
 
 
-def part1(data):
+def parse_input_array(data):
+    """Parse the grid into a 0/1 uint8 numpy array (1 where there is a roll).
+
+    Works directly on the raw bytes so that no per-cell Python objects are
+    created, which matters for very large grids.
+    """
+    raw = data.encode()
+    width = raw.find(b'\n')
+    if width == -1:
+        width = len(raw)
+    rows = (len(raw) + 1) // (width + 1)
+
+    # Append the missing final newline so every row is exactly width + 1 bytes
+    cells = np.frombuffer(raw + b'\n', dtype=np.uint8).reshape(rows, width + 1)
+    return (cells[:, :width] == ord('@')).view(np.uint8)
+
+
+def neighbour_counts(rolls):
+    """Count adjacent rolls for every cell using eight shifted adds.
+
+    The array is padded with a one-cell border of zeros so that every shift
+    is a plain slice and no bounds checks are needed.
+    """
+    rows, cols = rolls.shape
+    padded = np.pad(rolls, 1)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            if dr == 1 and dc == 1:
+                continue
+            counts += padded[dr:dr + rows, dc:dc + cols]
+    return counts
+
+
+def part1_numpy(data):
+    """Vectorised part 1: a roll is accessible when it has fewer than 4 neighbours."""
+    rolls = parse_input_array(data)
+    counts = neighbour_counts(rolls)
+    return int(np.count_nonzero(rolls & (counts < 4)))
+
+
+BITBOARD_DIGITS = str.maketrans({'@': '1', '.': '0', '\n': '0'})
+BITBOARD_CHARS = str.maketrans({'1': '@', '0': '.'})
+
+
+def parse_input_bitboard(data):
+    """Parse the grid into one big-int bitboard.
+
+    Cell (row, col) lives at bit ``row * stride + col`` where ``stride`` is
+    the row width plus one. The extra column is always zero and acts as a
+    guard, so horizontal shifts never wrap into the neighbouring row.
+    Returns ``(board, stride)``.
+    """
+    width = data.find('\n')
+    if width == -1:
+        width = len(data)
+    stride = width + 1
+
+    # Newlines land exactly on the guard column, so they just become zeros.
+    # The string is reversed because int() reads the most significant bit first.
+    digits = data.translate(BITBOARD_DIGITS)
+    return int(digits[::-1], 2), stride
+
+
+def bitboard_accessible(board, stride):
+    """Return a bitboard of rolls with fewer than 4 adjacent rolls.
+
+    The eight shifted boards are summed with a bit-sliced 2-bit counter
+    (``low``, ``high``). Any carry out of the counter means the cell has
+    seen at least 4 neighbours, which is all we need to know.
+    """
+    low = high = at_least_4 = 0
+    for shift in (1, stride - 1, stride, stride + 1):
+        for neighbours in (board >> shift, board << shift):
+            carry = low & neighbours
+            low ^= neighbours
+            overflow = high & carry
+            high ^= carry
+            at_least_4 |= overflow
+    return board & ~at_least_4
+
+
+def part1_bitboard(data):
+    """Big-int bitboard part 1, works without numpy."""
+    board, stride = parse_input_bitboard(data)
+    return bitboard_accessible(board, stride).bit_count()
+
+
+def part2_bitboard(data):
+    """Big-int bitboard part 2: remove every accessible roll each round."""
+    board, stride = parse_input_bitboard(data)
+
+    total_removed = 0
+    while True:
+        accessible = bitboard_accessible(board, stride)
+        if not accessible:
+            break
+        board &= ~accessible
+        total_removed += accessible.bit_count()
+
+    return total_removed
+
+
+def default_engine():
+    """Pick the fastest engine that is available in this environment."""
+    return 'numpy' if np is not None else 'bitboard'
+
+
+def part1(data, engine=None):
     """Count how many rolls of paper can be accessed by a forklift.
     
     A roll can be accessed if there are fewer than 4 rolls in adjacent positions.
     """
+    if engine is None:
+        engine = default_engine()
+    if engine == 'numpy':
+        return part1_numpy(data)
+    if engine == 'bitboard':
+        return part1_bitboard(data)
+    if engine != 'grid':
+        raise ValueError(f"Unknown engine: {engine}")
+
     grid = parse_input(data)
     rows = len(grid)
     cols = len(grid[0])
@@ -63,11 +192,77 @@ def part1(data):
     return accessible_count
 
 
-def part2(data):
+def part2_worklist(data):
+    """Incremental part 2: peel accessible rolls off a worklist, like k-core peeling.
+
+    Neighbour counts are computed once. Removing a roll only decrements its
+    neighbours, and a neighbour is queued at the moment its count drops from
+    4 to 3. Every roll is queued and removed at most once, so the total work
+    is O(cells) no matter how many rounds the round-based version would need.
+    The final set of removed rolls does not depend on the removal order, so
+    the total matches the round-based answer.
+    """
+    grid = parse_input(data)
+    rows = len(grid)
+    cols = len(grid[0])
+
+    # Flatten into a grid with a one-cell empty border so no bounds checks are needed
+    width = cols + 2
+    present = bytearray((rows + 2) * width)
+    rolls = []
+    for row in range(rows):
+        base = (row + 1) * width + 1
+        for col, char in enumerate(grid[row]):
+            if char == '@':
+                present[base + col] = 1
+                rolls.append(base + col)
+
+    offsets = (
+        -width - 1, -width, -width + 1,
+        -1,                 1,
+        width - 1,  width,  width + 1
+    )
+
+    counts = [0] * len(present)
+    queue = deque()
+    for idx in rolls:
+        count = 0
+        for offset in offsets:
+            count += present[idx + offset]
+        counts[idx] = count
+        if count < 4:
+            queue.append(idx)
+
+    total_removed = 0
+    while queue:
+        idx = queue.popleft()
+        present[idx] = 0
+        total_removed += 1
+
+        for offset in offsets:
+            neighbour = idx + offset
+            if present[neighbour]:
+                counts[neighbour] -= 1
+                # Only rolls that just crossed the threshold are new; ones already
+                # queued were below 4 before this decrement
+                if counts[neighbour] == 3:
+                    queue.append(neighbour)
+
+    return total_removed
+
+
+def part2(data, engine='worklist'):
     """Count total rolls that can be removed by repeatedly removing accessible rolls.
     
     Keep removing accessible rolls (< 4 adjacent) until no more can be removed.
     """
+    if engine == 'worklist':
+        return part2_worklist(data)
+    if engine == 'bitboard':
+        return part2_bitboard(data)
+    if engine != 'grid':
+        raise ValueError(f"Unknown engine: {engine}")
+
     grid = parse_input(data)
     rows = len(grid)
     cols = len(grid[0])
@@ -98,11 +293,169 @@ def part2(data):
     return total_removed
 
 
+def tiled_geometry(path):
+    """Return ``(stride, rows)`` of the grid file without loading it."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        while size and mm[size - 1:size].isspace():
+            size -= 1
+        width = mm.find(b'\n', 0, size)
+    if width == -1:
+        width = size
+    stride = width + 1
+    return stride, (size + 1) // stride
+
+
+def read_band(mm, stride, rows, start, stop):
+    """Read rows [start, stop) plus a one-row halo on each side as a bitboard.
+
+    Returns ``(board, interior)`` where ``interior`` masks the bits of the
+    rows the band owns, i.e. everything except the halo.
+    """
+    first = max(start - 1, 0)
+    last = min(stop + 1, rows)
+    text = mm[first * stride:last * stride].decode('ascii')
+    board = int(text.translate(BITBOARD_DIGITS)[::-1], 2)
+    interior = ((1 << ((stop - start) * stride)) - 1) << ((start - first) * stride)
+    return board, interior
+
+
+def write_band(mm, board, stride, start, stop):
+    """Write the rows [start, stop) of a band bitboard back into the grid file."""
+    first = max(start - 1, 0)
+    nbits = (stop - first) * stride
+    bits = format(board & ((1 << nbits) - 1), f'0{nbits}b')[::-1]
+    chars = bytearray(bits[(start - first) * stride:].translate(BITBOARD_CHARS), 'ascii')
+    chars[stride - 1::stride] = b'\n' * len(range(stride - 1, len(chars), stride))
+
+    offset = start * stride
+    # The last row may not be followed by a newline in the file
+    end = min(offset + len(chars), len(mm))
+    mm[offset:end] = chars[:end - offset]
+
+
+def count_band(task):
+    """Worker: count accessible rolls in one band of the grid file."""
+    path, stride, rows, start, stop = task
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        board, interior = read_band(mm, stride, rows, start, stop)
+    return (bitboard_accessible(board, stride) & interior).bit_count()
+
+
+def peel_band(task):
+    """Worker: peel one band of the shared state file until it is locally stable.
+
+    Halo rows are treated as fixed. A neighbouring band may be rewriting them
+    at the same time, but rolls only ever disappear, so a stale halo can only
+    overestimate neighbour counts and never causes a wrong removal.
+    """
+    path, stride, rows, start, stop = task
+    with open(path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+        board, interior = read_band(mm, stride, rows, start, stop)
+
+        removed = 0
+        while True:
+            accessible = bitboard_accessible(board, stride) & interior
+            if not accessible:
+                break
+            board &= ~accessible
+            removed += accessible.bit_count()
+
+        if removed:
+            write_band(mm, board, stride, start, stop)
+    return removed
+
+
+def make_bands(rows, band_rows):
+    """Split ``rows`` into consecutive ``(start, stop)`` row bands."""
+    return [(start, min(start + band_rows, rows)) for start in range(0, rows, band_rows)]
+
+
+def part1_tiled(path, band_rows=1024, workers=None):
+    """Part 1 over a memory-mapped grid file, one band per pool task.
+
+    Only a band and its halo rows are ever held in memory at once.
+    """
+    stride, rows = tiled_geometry(path)
+    tasks = [(path, stride, rows, start, stop) for start, stop in make_bands(rows, band_rows)]
+    with ProcessPoolExecutor(workers) as pool:
+        return sum(pool.map(count_band, tasks))
+
+
+def part2_tiled(path, band_rows=1024, workers=None):
+    """Part 2 over a memory-mapped grid file, peeling band by band.
+
+    The grid is copied to a scratch file that holds the shared state. Each
+    round peels every active band to a local fixpoint in the pool; the
+    updated edge rows reach neighbouring bands through the scratch file as
+    their halos in the next round. A band is rerun only when a neighbour
+    removed something, and the loop stops once no band changes.
+    """
+    stride, rows = tiled_geometry(path)
+    bands = make_bands(rows, band_rows)
+
+    fd, state_path = tempfile.mkstemp(suffix='.grid')
+    os.close(fd)
+    try:
+        shutil.copyfile(path, state_path)
+
+        total_removed = 0
+        active = range(len(bands))
+        with ProcessPoolExecutor(workers) as pool:
+            while active:
+                tasks = [(state_path, stride, rows) + bands[idx] for idx in active]
+                changed = set()
+                for idx, removed in zip(active, pool.map(peel_band, tasks)):
+                    if removed:
+                        total_removed += removed
+                        changed.update((idx - 1, idx + 1))
+                active = sorted(idx for idx in changed if 0 <= idx < len(bands))
+    finally:
+        os.remove(state_path)
+
+    return total_removed
+
+
+PART1_ENGINES = ('grid', 'numpy', 'bitboard')
+PART2_ENGINES = ('grid', 'worklist', 'bitboard')
+
+
+def benchmark(data, repeat=3):
+    """Time every available engine for both parts and print the best of `repeat` runs."""
+    import time
+
+    for label, solve, engines in (('Part 1', part1, PART1_ENGINES), ('Part 2', part2, PART2_ENGINES)):
+        for engine in engines:
+            if engine == 'numpy' and np is None:
+                print(f"{label} [{engine}]: skipped (numpy not installed)")
+                continue
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = solve(data, engine=engine)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{label} [{engine}]: {result} ({best * 1_000:.2f}ms)")
+
+
 def main():
     import sys
     # Read input (use command line argument if provided, otherwise default to input.txt)
-    filename = sys.argv[1] if len(sys.argv) > 1 else 'input.txt'
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    filename = args[0] if args else 'input.txt'
+
+    if '--tiled' in flags:
+        # Never load the whole grid, work on the memory-mapped file instead
+        print(f"Part 1: {part1_tiled(filename)}")
+        print(f"Part 2: {part2_tiled(filename)}")
+        return
+
     data = read_input(filename)
+
+    if '--bench' in flags:
+        benchmark(data)
+        return
     
     # Solve parts
     result1 = part1(data)
@@ -2,6 +2,13 @@
 """
 Advent of Code 2025 - Day 5: Cafeteria
 """
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, batch lookups fall back to bisect
+    np = None
+
 
 def read_input(filename='input.txt'):
     """Read and return the input file."""
@@ -35,16 +42,225 @@ def is_fresh(ingredient_id, fresh_ranges):
     return False
 
 
+def merge_ranges(fresh_ranges):
+    """Merge overlapping or adjacent inclusive ranges into a sorted disjoint list."""
+    merged = []
+    for start, end in sorted(fresh_ranges):
+        if merged and start <= merged[-1][1] + 1:
+            # Overlaps or adjacent with previous range, merge them
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            # No overlap, add as new range
+            merged.append((start, end))
+    return merged
+
+
+class IntervalIndex:
+    """Sorted, merged fresh ranges for fast freshness lookups.
+
+    The ranges are merged once into disjoint intervals stored as parallel
+    sorted start/end lists. An ID is fresh if the last interval starting at
+    or before it also ends at or after it.
+    """
+
+    def __init__(self, fresh_ranges):
+        merged = merge_ranges(fresh_ranges)
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+        # numpy copies for batch lookups, when the values fit in int64
+        self.start_array = self.end_array = None
+        if np is not None and merged and fits_int64(self.starts[0], self.ends[-1]):
+            self.start_array = np.array(self.starts, dtype=np.int64)
+            self.end_array = np.array(self.ends, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def contains(self, ingredient_id):
+        """Check a single ID with a binary search, O(log R)."""
+        idx = bisect_right(self.starts, ingredient_id) - 1
+        return idx >= 0 and ingredient_id <= self.ends[idx]
+
+    def count_contained(self, ingredient_ids):
+        """Count how many of the given IDs are fresh.
+
+        Uses one vectorised ``numpy.searchsorted`` over all IDs when numpy
+        is available and the values fit in int64, otherwise bisects each ID.
+        """
+        if self.start_array is not None:
+            ids = np.asarray(ingredient_ids)
+            if ids.dtype.kind in 'iu':
+                idx = np.searchsorted(self.start_array, ids, side='right') - 1
+                fresh = (idx >= 0) & (ids <= self.end_array[np.maximum(idx, 0)])
+                return int(np.count_nonzero(fresh))
+
+        return sum(1 for ingredient_id in ingredient_ids if self.contains(ingredient_id))
+
+    def total_ids(self):
+        """Count all IDs covered by the ranges."""
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+
+def fits_int64(low, high):
+    """Check that every value in [low, high] fits in a signed 64-bit integer."""
+    return -(1 << 63) <= low and high < (1 << 63)
+
+
+class IntervalSet:
+    """Mutable set of fresh IDs stored as disjoint, merged inclusive ranges.
+
+    Ranges live in a chunked sorted list (parallel start/end chunks plus the
+    last end of every chunk), in the style of sortedcontainers. Lookups are
+    two binary searches, O(log n). Edits only rebuild the chunks they touch,
+    splitting or merging them to keep every chunk near CHUNK_SIZE ranges.
+    The total number of fresh IDs (part 2's answer) is kept up to date, so it
+    never needs a full re-merge.
+
+    Ranges use set semantics. Adding merges with overlapping or adjacent
+    ranges, and removing splits whatever it cuts through.
+    """
+
+    CHUNK_SIZE = 512
+
+    def __init__(self, fresh_ranges=()):
+        self.starts = []
+        self.ends = []
+        self.maxes = []
+        self.total = 0
+        self.load(fresh_ranges)
+
+    def load(self, fresh_ranges):
+        """Bulk-load ranges with one sort-and-merge, replacing the current contents."""
+        merged = merge_ranges(fresh_ranges)
+        self.starts = []
+        self.ends = []
+        for pos in range(0, len(merged), self.CHUNK_SIZE):
+            chunk = merged[pos:pos + self.CHUNK_SIZE]
+            self.starts.append([start for start, _ in chunk])
+            self.ends.append([end for _, end in chunk])
+        self.maxes = [ends[-1] for ends in self.ends]
+        self.total = sum(end - start + 1 for start, end in merged)
+
+    def __len__(self):
+        return sum(len(starts) for starts in self.starts)
+
+    def __iter__(self):
+        for starts, ends in zip(self.starts, self.ends):
+            yield from zip(starts, ends)
+
+    def __contains__(self, ingredient_id):
+        chunk, offset = self.locate(ingredient_id)
+        return chunk < len(self.starts) and self.starts[chunk][offset] <= ingredient_id
+
+    def locate(self, value):
+        """Return the (chunk, offset) of the first range ending at or after value."""
+        chunk = bisect_left(self.maxes, value)
+        if chunk == len(self.maxes):
+            return chunk, 0
+        return chunk, bisect_left(self.ends[chunk], value)
+
+    def span(self, chunk, offset, limit):
+        """Collect the ranges from (chunk, offset) onwards that start at or before limit.
+
+        Returns the position just past the last one and the ranges themselves.
+        """
+        found = []
+        while chunk < len(self.starts):
+            starts = self.starts[chunk]
+            stop = bisect_right(starts, limit, offset)
+            found.extend(zip(starts[offset:stop], self.ends[chunk][offset:stop]))
+            if stop < len(starts) or chunk + 1 == len(self.starts):
+                return chunk, stop, found
+            if self.starts[chunk + 1][0] > limit:
+                return chunk, stop, found
+            chunk += 1
+            offset = 0
+        return chunk, 0, found
+
+    def replace(self, first, offset, last, stop, new_ranges):
+        """Replace the ranges between two positions with new_ranges and rebalance locally.
+
+        Like sortedcontainers, a chunk that grows past twice CHUNK_SIZE is
+        split into pieces of about CHUNK_SIZE, and one that shrinks below half
+        of it is merged into a neighbour, so the chunk count stays near
+        len(self) / CHUNK_SIZE whatever order the edits come in.
+        """
+        if first == len(self.starts):
+            # Appending past the end goes into the last chunk
+            if not new_ranges:
+                return
+            if not self.starts:
+                self.starts.append([])
+                self.ends.append([])
+                self.maxes.append(None)
+            first = last = len(self.starts) - 1
+            offset = stop = len(self.starts[first])
+
+        last = min(last, len(self.starts) - 1)
+        if first == last:
+            # The usual case, edit the one chunk in place
+            starts = self.starts[first]
+            ends = self.ends[first]
+            starts[offset:stop] = [start for start, _ in new_ranges]
+            ends[offset:stop] = [end for _, end in new_ranges]
+            small = len(starts) < self.CHUNK_SIZE // 2 and len(self.starts) > 1
+            if starts and not small and len(starts) <= 2 * self.CHUNK_SIZE:
+                self.maxes[first] = ends[-1]
+                return
+        else:
+            starts = self.starts[first][:offset] + [start for start, _ in new_ranges] + self.starts[last][stop:]
+            ends = self.ends[first][:offset] + [end for _, end in new_ranges] + self.ends[last][stop:]
+
+        if len(starts) < self.CHUNK_SIZE // 2 and last - first + 1 < len(self.starts):
+            # Too small to stand alone, fold in a neighbouring chunk
+            if last + 1 < len(self.starts):
+                last += 1
+                starts += self.starts[last]
+                ends += self.ends[last]
+            else:
+                first -= 1
+                starts = self.starts[first] + starts
+                ends = self.ends[first] + ends
+
+        size = len(starts)
+        pieces = size // self.CHUNK_SIZE if size > 2 * self.CHUNK_SIZE else min(size, 1)
+        bounds = [0] + [size * k // pieces for k in range(1, pieces + 1)]
+        self.starts[first:last + 1] = [starts[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+        self.ends[first:last + 1] = [ends[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+        self.maxes[first:last + 1] = [ends[hi - 1] for hi in bounds[1:]]
+
+    def add(self, start, end):
+        """Mark [start, end] as fresh, merging with overlapping or adjacent ranges."""
+        chunk, offset = self.locate(start - 1)
+        last, stop, merged = self.span(chunk, offset, end + 1)
+        if merged:
+            start = min(start, merged[0][0])
+            end = max(end, merged[-1][1])
+        self.total += (end - start + 1) - sum(e - s + 1 for s, e in merged)
+        self.replace(chunk, offset, last, stop, [(start, end)])
+
+    def remove(self, start, end):
+        """Mark [start, end] as spoiled, splitting any range it partly covers."""
+        chunk, offset = self.locate(start)
+        last, stop, cut = self.span(chunk, offset, end)
+        if not cut:
+            return
+        kept = []
+        if cut[0][0] < start:
+            kept.append((cut[0][0], start - 1))
+        if cut[-1][1] > end:
+            kept.append((end + 1, cut[-1][1]))
+        self.total -= sum(e - s + 1 for s, e in cut) - sum(e - s + 1 for s, e in kept)
+        self.replace(chunk, offset, last, stop, kept)
+
+
 def part1(data):
     """Count how many available ingredient IDs are fresh."""
     fresh_ranges, available_ids = parse_input(data)
     
-    fresh_count = 0
-    for ingredient_id in available_ids:
-        if is_fresh(ingredient_id, fresh_ranges):
-            fresh_count += 1
-    
-    return fresh_count
+    index = IntervalIndex(fresh_ranges)
+    return index.count_contained(available_ids)
 
 
 def part2(data):
@@ -54,25 +270,7 @@ def part2(data):
     """
     fresh_ranges, _ = parse_input(data)
     
-    # Sort ranges by start position
-    fresh_ranges.sort()
-    
-    # Merge overlapping ranges
-    merged = []
-    for start, end in fresh_ranges:
-        if merged and start <= merged[-1][1] + 1:
-            # Overlaps or adjacent with previous range, merge them
-            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-        else:
-            # No overlap, add as new range
-            merged.append((start, end))
-    
-    # Count total IDs in all merged ranges
-    total = 0
-    for start, end in merged:
-        total += (end - start + 1)
-    
-    return total
+    return IntervalIndex(fresh_ranges).total_ids()
 
 
 def main():
@@ -2,6 +2,11 @@
 """
 Advent of Code 2025 - Day 6: Trash Compactor
 """
+import math
+import mmap
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 
 def read_input(filename='input.txt'):
     """Read and return the input file."""
@@ -9,70 +14,164 @@ def read_input(filename='input.txt'):
         return f.read().rstrip('\n')
 
 
-def parse_input(data):
-    """Parse the worksheet into individual problems.
+def parse_worksheet(data):
+    """Pad and transpose the worksheet once and split it into problem blocks.
     
-    Problems are arranged vertically in columns, separated by empty columns.
+    Returns ``(rows, columns, blocks)``: the padded rows, the same worksheet
+    as column strings, and ``(start, stop)`` column ranges of each problem.
+    Blank separator columns are found in a single pass over the transposed
+    columns, and both reading orders are extracted from this table.
     """
-    lines = data.split('\n')
-    
-    if not lines:
-        return []
-    
-    # Find the width (length of the longest line)
-    width = max(len(line) for line in lines)
+    rows = data.split('\n')
+    width = max(len(row) for row in rows)
+    rows = [row.ljust(width) for row in rows]
+    columns = [''.join(column) for column in zip(*rows)]
     
-    # Pad all lines to the same width
-    padded_lines = [line.ljust(width) for line in lines]
+    blocks = []
+    start = None
+    for col, column in enumerate(columns):
+        if column.isspace():
+            if start is not None:
+                blocks.append((start, col))
+                start = None
+        elif start is None:
+            start = col
+    if start is not None:
+        blocks.append((start, width))
     
+    return rows, columns, blocks
+
+
+def problems_by_rows(rows, blocks):
+    """Read each problem row by row: one number per row, operator on the last row."""
     problems = []
-    col = 0
+    for start, stop in blocks:
+        operator = rows[-1][start:stop].strip()
+        numbers = []
+        for row in rows[:-1]:
+            number_str = row[start:stop].strip()
+            if number_str:
+                numbers.append(int(number_str))
+        problems.append((numbers, operator))
+    return problems
+
+
+def problems_by_columns(columns, blocks):
+    """Read each problem column by column, right to left.
     
-    while col < width:
-        # Skip empty columns
-        if all(line[col] == ' ' for line in padded_lines):
-            col += 1
-            continue
-        
-        # Found start of a problem, collect all columns until we hit an empty column
-        problem_cols = []
-        while col < width and not all(line[col] == ' ' for line in padded_lines):
-            problem_cols.append(col)
-            col += 1
-        
-        # Extract the problem from these columns
-        problem_lines = []
-        for line in padded_lines:
-            problem_text = ''.join(line[c] for c in problem_cols).strip()
-            if problem_text:
-                problem_lines.append(problem_text)
+    Each column is one number read top to bottom, and the operator sits in
+    the last row of one of the problem's columns.
+    """
+    problems = []
+    for start, stop in reversed(blocks):
+        numbers = []
+        operator = None
+        for column in reversed(columns[start:stop]):
+            number_str = column[:-1].replace(' ', '')
+            if number_str:
+                numbers.append(int(number_str))
+            if operator is None and column[-1] in '+*':
+                operator = column[-1]
         
-        if problem_lines:
-            # Last line is the operator, rest are numbers
-            operator = problem_lines[-1]
-            numbers = [int(num) for num in problem_lines[:-1]]
+        if numbers and operator:
             problems.append((numbers, operator))
-    
     return problems
 
 
+def parse_input(data):
+    """Parse the worksheet into individual problems.
+    
+    Problems are arranged vertically in columns, separated by empty columns.
+    """
+    rows, _, blocks = parse_worksheet(data)
+    return problems_by_rows(rows, blocks)
+
+
+# Products with more operands than this go through a balanced product tree
+PRODUCT_TREE_THRESHOLD = 16
+
+
+def product_tree(numbers):
+    """Multiply numbers pairwise in a balanced tree.
+    
+    Keeping the operands of each multiplication about the same size makes
+    the big-int cost close to a single large multiplication, instead of the
+    quadratic cost of multiplying left to right into a growing accumulator.
+    """
+    numbers = list(numbers)
+    if not numbers:
+        return 1
+    while len(numbers) > 1:
+        paired = [numbers[i] * numbers[i + 1] for i in range(0, len(numbers) - 1, 2)]
+        if len(numbers) % 2:
+            paired.append(numbers[-1])
+        numbers = paired
+    return numbers[0]
+
+
 def solve_problem(numbers, operator):
     """Solve a single problem by applying the operator to all numbers."""
     if operator == '+':
         return sum(numbers)
     elif operator == '*':
-        result = 1
-        for num in numbers:
-            result *= num
-        return result
+        if len(numbers) <= PRODUCT_TREE_THRESHOLD:
+            return math.prod(numbers)
+        return product_tree(numbers)
     else:
         raise ValueError(f"Unknown operator: {operator}")
 
 
-def part1(data):
-    """Solve all problems and return the grand total."""
+def evaluate_chunk(problems):
+    """Worker: solve a chunk of problems, timing the work spent on each operator."""
+    subtotal = 0
+    op_times = {}
+    for numbers, operator in problems:
+        start = time.perf_counter()
+        subtotal += solve_problem(numbers, operator)
+        op_times[operator] = op_times.get(operator, 0.0) + time.perf_counter() - start
+    return subtotal, op_times
+
+
+def evaluate_problems(problems, workers=None, chunk_size=1024):
+    """Solve independent problems across a process pool, in chunks.
+    
+    Returns ``(grand_total, op_times)`` where ``op_times`` maps each operator
+    to the total time spent evaluating its problems. With ``workers=1`` the
+    chunks run serially in this process.
+    """
+    problems = list(problems)
+    chunks = [problems[i:i + chunk_size] for i in range(0, len(problems), chunk_size)]
+    
+    if workers == 1 or len(chunks) <= 1:
+        results = map(evaluate_chunk, chunks)
+        return merge_chunk_results(results)
+    
+    with ProcessPoolExecutor(workers) as pool:
+        return merge_chunk_results(pool.map(evaluate_chunk, chunks))
+
+
+def merge_chunk_results(results):
+    """Combine per-chunk subtotals and operator timings."""
+    grand_total = 0
+    op_times = {}
+    for subtotal, chunk_times in results:
+        grand_total += subtotal
+        for operator, seconds in chunk_times.items():
+            op_times[operator] = op_times.get(operator, 0.0) + seconds
+    return grand_total, op_times
+
+
+def part1(data, workers=None):
+    """Solve all problems and return the grand total.
+    
+    Passing ``workers`` evaluates the problems in chunks across that many
+    processes instead (0 for one per CPU), see evaluate_problems.
+    """
     problems = parse_input(data)
     
+    if workers is not None:
+        return evaluate_problems(problems, workers or None)[0]
+    
     grand_total = 0
     for numbers, operator in problems:
         answer = solve_problem(numbers, operator)
@@ -90,81 +189,123 @@ def parse_input_rtl(data):
     - Problems are groups of columns separated by empty columns
     - Read problems right-to-left
     """
-    lines = data.split('\n')
+    _, columns, blocks = parse_worksheet(data)
+    return problems_by_columns(columns, blocks)
+
+
+def part2(data, workers=None):
+    """Solve all problems reading right-to-left (column-based) and return the grand total.
     
-    if not lines:
-        return []
+    Passing ``workers`` evaluates the problems in chunks across that many
+    processes instead (0 for one per CPU), see evaluate_problems.
+    """
+    problems = parse_input_rtl(data)
     
-    # Find the width
-    width = max(len(line) for line in lines)
+    if workers is not None:
+        return evaluate_problems(problems, workers or None)[0]
     
-    # Pad all lines to the same width
-    padded_lines = [line.ljust(width) for line in lines]
+    grand_total = 0
+    for numbers, operator in problems:
+        answer = solve_problem(numbers, operator)
+        grand_total += answer
     
-    problems = []
-    col = width - 1  # Start from the rightmost column
+    return grand_total
+
+
+def row_spans(mm):
+    """Return the byte offset and length of every row in a memory-mapped worksheet."""
+    offsets = []
+    lengths = []
+    pos = 0
+    while pos < len(mm):
+        end = mm.find(b'\n', pos)
+        if end == -1:
+            end = len(mm)
+        offsets.append(pos)
+        lengths.append(end - pos)
+        pos = end + 1
+
+    # Trailing blank lines are not part of the worksheet
+    while lengths and lengths[-1] == 0:
+        offsets.pop()
+        lengths.pop()
+    return offsets, lengths
+
+
+def block_problems(block, reading):
+    """Turn the column strings of one closed problem block into problems."""
+    if reading == 'columns':
+        return problems_by_columns(block, [(0, len(block))])
+    rows = [''.join(row) for row in zip(*block)]
+    return problems_by_rows(rows, [(0, len(block))])
+
+
+def stream_problems(filename, reading='rows', window=1 << 16):
+    """Yield problems from a worksheet file from left to right without loading it.
     
-    while col >= 0:
-        # Skip empty columns
-        if all(line[col] == ' ' for line in padded_lines):
-            col -= 1
-            continue
-        
-        # Found start of a problem (reading right-to-left)
-        # Collect all columns until we hit an empty column
-        problem_cols = []
-        while col >= 0 and not all(line[col] == ' ' for line in padded_lines):
-            problem_cols.append(col)
-            col -= 1
-        
-        # Each column in problem_cols represents one complete number
-        # Read each column top-to-bottom
-        numbers = []
-        operator = None
-        
-        for col_idx in problem_cols:
-            # Read this column top-to-bottom to form a number
-            number_str = ''
-            for row_idx in range(len(padded_lines) - 1):  # All rows except last
-                char = padded_lines[row_idx][col_idx]
-                if char != ' ':
-                    number_str += char
-            
-            if number_str:
-                numbers.append(int(number_str))
+    The file is memory-mapped and all rows are walked in lock-step, ``window``
+    columns at a time. A problem is yielded as soon as a blank separator
+    column closes its block, so memory is bounded by the window size times
+    the row count (plus the columns of the problem currently open).
+    ``reading`` is ``'rows'`` for part 1 or ``'columns'`` for part 2.
+    """
+    if reading not in ('rows', 'columns'):
+        raise ValueError(f"Unknown reading order: {reading}")
+    
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offsets, lengths = row_spans(mm)
+        width = max(lengths, default=0)
         
-        # Last row has the operator - check any column in this problem
-        operator_line = padded_lines[-1]
-        for col_idx in problem_cols:
-            char = operator_line[col_idx]
-            if char in ['+', '*']:
-                operator = char
-                break
+        block = []
+        for left in range(0, width, window):
+            right = min(left + window, width)
+            pieces = [
+                mm[offset + min(left, length):offset + min(right, length)].decode('ascii').ljust(right - left)
+                for offset, length in zip(offsets, lengths)
+            ]
+            for column in zip(*pieces):
+                column = ''.join(column)
+                if not column.isspace():
+                    block.append(column)
+                elif block:
+                    yield from block_problems(block, reading)
+                    block = []
         
-        if numbers and operator:
-            problems.append((numbers, operator))
-    
-    return problems
+        if block:
+            yield from block_problems(block, reading)
 
 
-def part2(data):
-    """Solve all problems reading right-to-left (column-based) and return the grand total."""
-    problems = parse_input_rtl(data)
-    
+def stream_grand_total(filename, reading='rows', window=1 << 16):
+    """Keep a running grand total over the problems streamed from a worksheet file."""
     grand_total = 0
-    for numbers, operator in problems:
-        answer = solve_problem(numbers, operator)
-        grand_total += answer
-    
+    for numbers, operator in stream_problems(filename, reading, window):
+        grand_total += solve_problem(numbers, operator)
     return grand_total
 
 
 def main():
     import sys
     # Read input (use command line argument if provided, otherwise default to input.txt)
-    filename = sys.argv[1] if len(sys.argv) > 1 else 'input.txt'
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    filename = args[0] if args else 'input.txt'
+    
+    if '--stream' in flags:
+        # Never load the whole worksheet, walk the memory-mapped file instead
+        print(f"Part 1: {stream_grand_total(filename, 'rows')}")
+        print(f"Part 2: {stream_grand_total(filename, 'columns')}")
+        return
+    
     data = read_input(filename)
     
+    if '--profile' in flags:
+        # Show where the cost of each grand total comes from
+        for label, problems in (('Part 1', parse_input(data)), ('Part 2', parse_input_rtl(data))):
+            grand_total, op_times = evaluate_problems(problems)
+            timings = ', '.join(f"{op} {seconds * 1_000:.2f}ms" for op, seconds in sorted(op_times.items()))
+            print(f"{label}: {grand_total} ({timings})")
+        return
+    
     # Solve parts
     result1 = part1(data)
     print(f"Part 1: {result1}")
@@ -2,6 +2,15 @@
 """
 Advent of Code 2025 - Day 7: Laboratories
 """
+import heapq
+from bisect import bisect_right
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the 'numpy' engine needs it
+    np = None
+
 
 def read_input(filename='input.txt'):
     """Read and return the input file."""
@@ -89,9 +98,183 @@ def simulate_beam(grid, start_pos):
     return split_count
 
 
-def part1(data):
+def sweep_manifold(grid, start_pos):
+    """
+    Sweep the manifold top to bottom once, keeping the number of timelines
+    that have a beam in each column of the current row.
+    Returns (split_count, timeline_count) using O(cols) memory and no recursion.
+    
+    Beams that meet in the same cell merge for the split count (a splitter
+    is counted once however many timelines reach it), while their timeline
+    counts add up.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows > 0 else 0
+    start_row, start_col = start_pos
+    
+    counts = [0] * cols
+    counts[start_col] = 1
+    split_count = 0
+    
+    for row in range(start_row + 1, rows):
+        line = grid[row]
+        next_counts = [0] * cols
+        
+        for col, count in enumerate(counts):
+            if not count:
+                continue
+            
+            if line[col] == '^':
+                # Splitter - every timeline here branches left and right
+                split_count += 1
+                if col - 1 >= 0:
+                    next_counts[col - 1] += count
+                if col + 1 < cols:
+                    next_counts[col + 1] += count
+            else:
+                next_counts[col] += count
+        
+        counts = next_counts
+    
+    # Every remaining timeline exits through the bottom row
+    return split_count, sum(counts)
+
+
+def parse_input_array(data):
+    """Parse the manifold into a boolean splitter mask and the start position."""
+    lines = data.split('\n')
+    width = max(len(line) for line in lines)
+    raw = ''.join(line.ljust(width) for line in lines).encode()
+    cells = np.frombuffer(raw, dtype=np.uint8).reshape(len(lines), width)
+    
+    start_index = raw.find(b'S')
+    start_pos = divmod(start_index, width) if start_index != -1 else None
+    return cells == ord('^'), start_pos
+
+
+# uint64 counts are safe while every cell receives at most 3 values below this
+UINT64_SAFE_COUNT = (2**64 - 1) // 3
+
+
+def sweep_manifold_numpy(data):
+    """
+    Vectorised version of sweep_manifold for very wide manifolds.
+    Returns (split_count, timeline_count).
+    
+    Counts are kept as uint64 and advanced a whole row at a time. Rows
+    without splitters leave the counts unchanged and are skipped. Once a
+    count gets big enough that the next row could overflow, the array
+    switches to object dtype so that Python ints carry on exactly.
+    """
+    splitters, start_pos = parse_input_array(data)
+    start_row, start_col = start_pos
+    
+    counts = np.zeros(splitters.shape[1], dtype=np.uint64)
+    counts[start_col] = 1
+    split_count = 0
+    
+    splitter_rows = np.flatnonzero(splitters.any(axis=1))
+    for row in splitter_rows[splitter_rows > start_row]:
+        if counts.dtype != object and counts.max() > UINT64_SAFE_COUNT:
+            counts = counts.astype(object)
+        
+        # Counts arriving on a splitter are shifted left and right,
+        # everything else passes straight through
+        on_splitter = splitters[row]
+        hit = np.where(on_splitter, counts, 0).astype(counts.dtype)
+        split_count += int(np.count_nonzero(hit))
+        
+        counts = np.where(on_splitter, 0, counts).astype(counts.dtype)
+        counts[:-1] += hit[1:]
+        counts[1:] += hit[:-1]
+    
+    # The grand total can overflow even when every column fits
+    if counts.dtype != object and int(counts.max()) * counts.size > 2**64 - 1:
+        counts = counts.astype(object)
+    return split_count, int(counts.sum())
+
+
+def build_splitter_index(data):
+    """
+    Index the splitters by column: each column maps to the sorted list of rows
+    holding a splitter. Returns (index, width, start_pos).
+    """
+    lines = data.split('\n')
+    index = defaultdict(list)
+    start_pos = None
+    
+    for row, line in enumerate(lines):
+        col = line.find('^')
+        while col != -1:
+            index[col].append(row)
+            col = line.find('^', col + 1)
+        if start_pos is None and 'S' in line:
+            start_pos = (row, line.index('S'))
+    
+    return index, len(lines[0]), start_pos
+
+
+def simulate_events(data):
+    """
+    Event-driven simulation over the splitter index.
+    Returns (split_count, timeline_count).
+    
+    A beam jumps straight to the next splitter below it in its column with a
+    bisect. Splitter hits are processed in row order from a heap, and the
+    timeline counts of beams that reach the same splitter are merged before
+    it fires, so the runtime depends on the number of splitters rather than
+    on the grid area.
+    """
+    index, cols, start_pos = build_splitter_index(data)
+    
+    pending = {}  # (row, col) of a splitter -> timelines arriving there
+    events = []
+    timelines = 0
+    
+    def send_beam(row, col, count):
+        """Send `count` timelines down column `col` from just below `row`."""
+        nonlocal timelines
+        splitter_rows = index.get(col)
+        pos = bisect_right(splitter_rows, row) if splitter_rows else 0
+        if not splitter_rows or pos == len(splitter_rows):
+            # No splitter below, the beam exits the manifold
+            timelines += count
+            return
+        
+        event = (splitter_rows[pos], col)
+        if event in pending:
+            pending[event] += count
+        else:
+            pending[event] = count
+            heapq.heappush(events, event)
+    
+    send_beam(start_pos[0], start_pos[1], 1)
+    split_count = 0
+    
+    while events:
+        row, col = heapq.heappop(events)
+        count = pending.pop((row, col))
+        split_count += 1
+        
+        if col - 1 >= 0:
+            send_beam(row, col - 1, count)
+        if col + 1 < cols:
+            send_beam(row, col + 1, count)
+    
+    return split_count, timelines
+
+
+def part1(data, engine='sweep'):
     """Count how many times the beam is split."""
+    if engine == 'numpy':
+        return sweep_manifold_numpy(data)[0]
+    if engine == 'events':
+        return simulate_events(data)[0]
     grid, start_pos = parse_input(data)
+    if engine == 'sweep':
+        return sweep_manifold(grid, start_pos)[0]
+    if engine != 'simulate':
+        raise ValueError(f"Unknown engine: {engine}")
     return simulate_beam(grid, start_pos)
 
 
@@ -144,9 +327,17 @@ def count_timelines(grid, start_pos):
     return count_from_position(start_pos[0], start_pos[1])
 
 
-def part2(data):
-    """Count the number of timelines using memoized recursion."""
+def part2(data, engine='sweep'):
+    """Count the number of timelines with a row sweep (or memoized recursion)."""
+    if engine == 'numpy':
+        return sweep_manifold_numpy(data)[1]
+    if engine == 'events':
+        return simulate_events(data)[1]
     grid, start_pos = parse_input(data)
+    if engine == 'sweep':
+        return sweep_manifold(grid, start_pos)[1]
+    if engine != 'memo':
+        raise ValueError(f"Unknown engine: {engine}")
     return count_timelines(grid, start_pos)
 
 
@@ -3,7 +3,13 @@
 Advent of Code 2025 - Day 8: Playground
 """
 import heapq
-from collections import defaultdict
+import math
+from collections import Counter, defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the 'numpy' engines need it
+    np = None
 
 
 def read_input(filename='input.txt'):
@@ -29,17 +35,30 @@ def distance(p1, p2):
 
 
 class UnionFind:
-    """Union-Find data structure for tracking connected components."""
+    """Union-Find data structure for tracking connected components.
+    
+    Find uses iterative path halving, so there is no recursion depth to
+    worry about. Component statistics are kept up to date as unions happen:
+    ``count`` is the number of components, ``sizes`` counts the components
+    of each size above one, and a lazy max-heap over those sizes keeps the
+    largest few at hand. Each union is O(log n) on top of the finds.
+    """
     
     def __init__(self, n):
         self.parent = list(range(n))
         self.size = [1] * n
+        self.count = n
+        self.singletons = n
+        self.sizes = {}  # size -> number of components that size, for sizes > 1
+        self.heap = []  # negated sizes, may hold stale entries
     
     def find(self, x):
-        """Find root of x with path compression."""
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        """Find root of x with path halving."""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
     
     def union(self, x, y):
         """Union two components. Returns True if they were not already connected."""
@@ -50,62 +69,434 @@ class UnionFind:
             return False
         
         # Union by size
-        if self.size[root_x] < self.size[root_y]:
+        size = self.size
+        size_x = size[root_x]
+        size_y = size[root_y]
+        if size_x < size_y:
             root_x, root_y = root_y, root_x
+            size_x, size_y = size_y, size_x
         
+        new_size = size_x + size_y
         self.parent[root_y] = root_x
-        self.size[root_x] += self.size[root_y]
+        size[root_x] = new_size
+        self.count -= 1
+        
+        # Update the size counts: two components out, the merged one in
+        sizes = self.sizes
+        for old_size in (size_x, size_y):
+            if old_size == 1:
+                self.singletons -= 1
+            elif sizes[old_size] == 1:
+                del sizes[old_size]
+            else:
+                sizes[old_size] -= 1
+        if new_size in sizes:
+            sizes[new_size] += 1
+        else:
+            sizes[new_size] = 1
+            heapq.heappush(self.heap, -new_size)
         return True
     
+    def union_many(self, pairs):
+        """Union every (x, y) pair in turn. Returns how many merges happened."""
+        merges = 0
+        for x, y in pairs:
+            if self.union(x, y):
+                merges += 1
+        return merges
+    
+    def top_sizes(self, k=3):
+        """Sizes of the k largest components, largest first (fewer if there aren't k)."""
+        heap = self.heap
+        top = []
+        live = []
+        while heap and len(top) < k:
+            size = -heapq.heappop(heap)
+            count = self.sizes.get(size, 0)
+            if count and (not live or live[-1] != size):
+                live.append(size)
+                top.extend([size] * min(count, k - len(top)))
+        # Stale and duplicate entries stay popped; live sizes go back
+        for size in live:
+            heapq.heappush(heap, -size)
+        return top + [1] * min(k - len(top), self.singletons)
+    
     def get_component_sizes(self):
         """Get sizes of all connected components."""
-        components = defaultdict(int)
-        for i in range(len(self.parent)):
-            root = self.find(i)
-            components[root] = self.size[root]
-        return list(components.values())
+        sizes = []
+        for size, count in sorted(self.sizes.items()):
+            sizes.extend([size] * count)
+        return sizes + [1] * self.singletons
+
+
+class EdgeStore:
+    """Every pair of points as compact numpy arrays, for mid-size inputs.
+    
+    Squared distances are computed one row at a time into an int64 array,
+    with the endpoints in two uint32 arrays. That is 16 bytes per edge,
+    against roughly 100 for a list of (float, int, int) tuples, and the
+    temporaries for each row are only O(n). Pairs are generated in (i, j)
+    order with i < j, so stable sorts on the distance reproduce the
+    (dist, i, j) tie-breaking of the sorted list.
+    
+    Build one with EdgeStore.from_data and pass it to part1/part2 as
+    store= to share it between the parts; it is freed with the last
+    reference, nothing caches it.
+    """
+    
+    def __init__(self, positions):
+        points = np.array(positions, dtype=np.int64).reshape(-1, 3)
+        n = len(points)
+        num_edges = n * (n - 1) // 2
+        self.dist = np.empty(num_edges, dtype=np.int64)
+        self.i = np.empty(num_edges, dtype=np.uint32)
+        self.j = np.empty(num_edges, dtype=np.uint32)
+        
+        pos = 0
+        for i in range(n - 1):
+            # Distances from point i to every later point, so j > i
+            diff = points[i + 1:] - points[i]
+            count = n - 1 - i
+            np.einsum('ak,ak->a', diff, diff, out=self.dist[pos:pos + count])
+            self.i[pos:pos + count] = i
+            self.j[pos:pos + count] = np.arange(i + 1, n, dtype=np.uint32)
+            pos += count
+        
+        self.order = None
+    
+    @classmethod
+    def from_data(cls, data):
+        """Build the edge store for a raw puzzle input."""
+        return cls(parse_input(data))
+    
+    def __len__(self):
+        return len(self.dist)
+    
+    def edges(self, indices):
+        """Turn edge indices into a list of (squared_dist, i, j) tuples."""
+        return list(zip(self.dist[indices].tolist(), self.i[indices].tolist(), self.j[indices].tolist()))
+    
+    def first_edges(self, k):
+        """The k smallest edges in (squared_dist, i, j) order, via argpartition."""
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        if self.order is not None:
+            return self.edges(self.order[:k])
+        
+        # Everything strictly below the k-th distance, plus all ties with it
+        kth = self.dist[np.argpartition(self.dist, k - 1)[k - 1]]
+        candidates = np.flatnonzero(self.dist <= kth)
+        ranked = candidates[np.lexsort((self.j[candidates], self.i[candidates], self.dist[candidates]))]
+        return self.edges(ranked[:k])
+    
+    def sorted_order(self):
+        """Indices of all edges in (squared_dist, i, j) order, computed once."""
+        if self.order is None:
+            self.order = np.lexsort((self.j, self.i, self.dist))
+        return self.order
+    
+    def iter_sorted_pairs(self, chunk_size=65536):
+        """Yield (i, j) in sorted edge order, converting one slice at a time."""
+        order = self.sorted_order()
+        for pos in range(0, len(order), chunk_size):
+            chunk = order[pos:pos + chunk_size]
+            yield from zip(self.i[chunk].tolist(), self.j[chunk].tolist())
+
+
+def squared_distance(p1, p2):
+    """Calculate the exact squared Euclidean distance between two 3D points."""
+    return (p1[0] - p2[0])**2 + (p1[1] - p2[1])**2 + (p1[2] - p2[2])**2
+
+
+# The 13 neighbouring cells "after" a cell, so each pair of cells is visited once
+HALF_SHELL = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+
+def pairs_within(positions, radius, k):
+    """Find the k smallest (squared_dist, i, j) pairs among those at most radius apart.
+    
+    Points are hashed into a uniform grid of cubes with side `radius`, so only
+    pairs in the same or adjacent cells are measured. A bounded max-heap keeps
+    the best k seen so far. May return fewer than k pairs if the radius is
+    too small.
+    """
+    cells = defaultdict(list)
+    for idx, (x, y, z) in enumerate(positions):
+        cells[(x // radius, y // radius, z // radius)].append(idx)
+    
+    limit = radius * radius
+    heap = []  # entries are (-d2, -i, -j), so the worst kept pair is on top
+    
+    def consider(i, j):
+        if i > j:
+            i, j = j, i
+        d2 = squared_distance(positions[i], positions[j])
+        if d2 > limit:
+            return
+        entry = (-d2, -i, -j)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    
+    for (cx, cy, cz), members in cells.items():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                consider(members[a], members[b])
+        
+        for dx, dy, dz in HALF_SHELL:
+            others = cells.get((cx + dx, cy + dy, cz + dz))
+            if others:
+                for i in members:
+                    for j in others:
+                        consider(i, j)
+    
+    return sorted((-d2, -i, -j) for d2, i, j in heap)
+
+
+def cell_pairs(positions, radius):
+    """Count the pairs of points that share a grid cell of side radius, in O(n)."""
+    cells = Counter((x // radius, y // radius, z // radius) for x, y, z in positions)
+    return sum(count * (count - 1) // 2 for count in cells.values())
+
+
+def closest_pairs(positions, k):
+    """Return the k globally closest pairs as sorted (squared_dist, i, j) tuples.
+    
+    Never materialises all pairs: memory is O(n + k). The search radius is
+    first estimated from the point density, assuming a roughly uniform
+    spread. Outliers and clusters inflate that estimate, so it is halved
+    while more than k pairs share a grid cell, which costs O(n) per step
+    and measures no pairs. It is then doubled until at least k pairs fall
+    within it. At that point the k best pairs inside the radius are the k
+    best overall.
+    """
+    n = len(positions)
+    k = min(k, n * (n - 1) // 2)
+    if k <= 0:
+        return []
+    
+    volume = 1
+    for axis in range(3):
+        coords = [p[axis] for p in positions]
+        volume *= max(coords) - min(coords) + 1
+    
+    # Expected number of pairs within r is about n^2/2 * (4/3 pi r^3) / volume
+    radius = max(1, math.ceil((3 * k * volume / (2 * math.pi * n * n)) ** (1 / 3)))
+    # For an even spread about k/4 pairs share a cell, so this leaves it alone
+    while radius > 1 and cell_pairs(positions, radius) > k:
+        radius = (radius + 1) // 2
+    while True:
+        pairs = pairs_within(positions, radius, k)
+        if len(pairs) == k:
+            return pairs
+        radius *= 2
 
 
-def part1(data, num_connections=1000):
+def part1(data, num_connections=1000, engine='spatial', store=None):
     """Connect the closest pairs and find product of three largest circuits."""
     positions = parse_input(data)
     n = len(positions)
     
-    # Generate all pairs with their distances
-    edges = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = distance(positions[i], positions[j])
-            edges.append((dist, i, j))
-    
-    # Sort by distance
-    edges.sort()
+    if engine == 'spatial':
+        edges = closest_pairs(positions, num_connections)
+    elif engine == 'numpy':
+        if store is None:
+            store = EdgeStore(positions)
+        edges = store.first_edges(num_connections)
+    elif engine == 'sorted':
+        # Generate all pairs with their distances
+        edges = []
+        for i in range(n):
+            for j in range(i + 1, n):
+                dist = distance(positions[i], positions[j])
+                edges.append((dist, i, j))
+        
+        # Sort by distance
+        edges.sort()
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
     
     # Use Union-Find to track circuits
     uf = UnionFind(n)
     
     # Make the first num_connections edge attempts
-    for idx, (dist, i, j) in enumerate(edges):
-        if idx >= num_connections:
-            break
-        uf.union(i, j)
-    
-    # Get component sizes
-    sizes = uf.get_component_sizes()
-    sizes.sort(reverse=True)
+    uf.union_many((i, j) for dist, i, j in edges[:num_connections])
     
     # Multiply the three largest
+    sizes = uf.top_sizes(3)
     if len(sizes) >= 3:
         return sizes[0] * sizes[1] * sizes[2]
     else:
         return 0
 
 
-def part2(data):
+class KDTree:
+    """Static kd-tree over 3D points, used for nearest-other-component queries.
+    
+    Nodes are stored in flat lists, in pre-order, so every child has a larger
+    index than its parent. Each node covers the slice order[lo:hi] of the
+    point indices and keeps the bounding box of those points.
+    """
+    
+    LEAF_SIZE = 16
+    
+    def __init__(self, points):
+        self.points = points
+        self.order = list(range(len(points)))
+        self.lo = []
+        self.hi = []
+        self.left = []
+        self.right = []
+        self.box_min = []
+        self.box_max = []
+        if points:
+            self.build(0, len(points))
+    
+    def build(self, lo, hi):
+        """Build the subtree for order[lo:hi] and return its node index."""
+        points = self.points
+        members = self.order[lo:hi]
+        box_min = tuple(min(points[i][axis] for i in members) for axis in range(3))
+        box_max = tuple(max(points[i][axis] for i in members) for axis in range(3))
+        
+        node = len(self.lo)
+        self.lo.append(lo)
+        self.hi.append(hi)
+        self.box_min.append(box_min)
+        self.box_max.append(box_max)
+        self.left.append(-1)
+        self.right.append(-1)
+        
+        if hi - lo > self.LEAF_SIZE:
+            # Split at the median of the widest axis
+            axis = max(range(3), key=lambda a: box_max[a] - box_min[a])
+            members.sort(key=lambda i: points[i][axis])
+            self.order[lo:hi] = members
+            mid = (lo + hi) // 2
+            self.left[node] = self.build(lo, mid)
+            self.right[node] = self.build(mid, hi)
+        return node
+    
+    def box_distance(self, point, node):
+        """Squared distance from a point to a node's bounding box (0 if inside)."""
+        total = 0
+        for coord, low, high in zip(point, self.box_min[node], self.box_max[node]):
+            if coord < low:
+                total += (low - coord) ** 2
+            elif coord > high:
+                total += (coord - high) ** 2
+        return total
+    
+    def node_components(self, comp):
+        """Label every node with its points' component, or -1 if they are mixed."""
+        labels = [-1] * len(self.lo)
+        for node in range(len(self.lo) - 1, -1, -1):
+            if self.left[node] == -1:
+                first = comp[self.order[self.lo[node]]]
+                if all(comp[i] == first for i in self.order[self.lo[node]:self.hi[node]]):
+                    labels[node] = first
+            elif labels[self.left[node]] == labels[self.right[node]]:
+                labels[node] = labels[self.left[node]]
+        return labels
+    
+    def nearest_other(self, i, comp, labels, best):
+        """Find the best (squared_dist, a, b) edge from point i to another component.
+        
+        `best` is the best edge known so far (or None) and is used for
+        pruning. Edges compare by (squared_dist, a, b) with a < b, so ties
+        are broken the same way as in a sorted edge list.
+        """
+        points = self.points
+        point = points[i]
+        own = comp[i]
+        stack = [0]
+        
+        while stack:
+            node = stack.pop()
+            if labels[node] == own:
+                continue
+            if best is not None and self.box_distance(point, node) > best[0]:
+                continue
+            
+            if self.left[node] == -1:
+                for j in self.order[self.lo[node]:self.hi[node]]:
+                    if comp[j] != own:
+                        edge = (squared_distance(point, points[j]), min(i, j), max(i, j))
+                        if best is None or edge < best:
+                            best = edge
+            else:
+                # Visit the nearer child first so the bound tightens quickly
+                near, far = self.left[node], self.right[node]
+                if self.box_distance(point, near) > self.box_distance(point, far):
+                    near, far = far, near
+                stack.append(far)
+                stack.append(near)
+        
+        return best
+
+
+def euclidean_mst(positions):
+    """Euclidean minimum spanning tree with Boruvka's algorithm over a kd-tree.
+    
+    Returns the MST edges as (squared_dist, i, j) tuples, sorted in the order
+    Kruskal would add them, so the last one is the final merge. Each round
+    finds every component's shortest edge to another component with kd-tree
+    queries, never building the complete graph. Edges are totally ordered by
+    (squared_dist, i, j), which keeps the rounds consistent and reproduces
+    the tie-breaking of a sorted edge list.
+    """
+    n = len(positions)
+    tree = KDTree(positions)
+    uf = UnionFind(n)
+    mst = []
+    
+    while uf.count > 1:
+        comp = [uf.find(i) for i in range(n)]
+        labels = tree.node_components(comp)
+        
+        # Best outgoing edge per component, shared by all its points for pruning
+        best = {}
+        for i in range(n):
+            edge = tree.nearest_other(i, comp, labels, best.get(comp[i]))
+            if edge is not None:
+                best[comp[i]] = edge
+        
+        for edge in sorted(set(best.values())):
+            if uf.union(edge[1], edge[2]):
+                mst.append(edge)
+    
+    mst.sort()
+    return mst
+
+
+def part2(data, engine='emst', store=None):
     """Find the last connection needed to form one circuit."""
     positions = parse_input(data)
     n = len(positions)
     
+    if engine == 'emst':
+        mst = euclidean_mst(positions)
+        if not mst:
+            return 0
+        _, i, j = mst[-1]
+        return positions[i][0] * positions[j][0]
+    if engine == 'numpy':
+        if store is None:
+            store = EdgeStore(positions)
+        uf = UnionFind(n)
+        for i, j in store.iter_sorted_pairs():
+            if uf.union(i, j) and uf.count == 1:
+                return positions[i][0] * positions[j][0]
+        return 0
+    if engine != 'kruskal':
+        raise ValueError(f"Unknown engine: {engine}")
+    
     # Generate all pairs with their distances
     edges = []
     for i in range(n):
@@ -120,16 +511,14 @@ def part2(data):
     uf = UnionFind(n)
     
     # Keep connecting until all nodes are in one component
-    num_components = n
     last_connection = None
     
     for dist, i, j in edges:
         if uf.union(i, j):
-            num_components -= 1
             last_connection = (i, j)
             
             # Check if we've formed one complete circuit
-            if num_components == 1:
+            if uf.count == 1:
                 break
     
     if last_connection:
@@ -2,6 +2,11 @@
 """
 Advent of Code 2025 - Day 9: Movie Theater
 """
+import heapq
+import multiprocessing
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
 
 def read_input(filename='input.txt'):
     """Read and return the input file."""
@@ -30,21 +35,105 @@ def calculate_area(p1, p2):
     return width * height
 
 
-def part1(data):
-    """Find largest rectangle using two red tiles as opposite corners."""
+def staircase(tiles, x_sign, y_sign):
+    """Return the tiles not dominated towards one corner of the plane.
+    
+    With x_sign = y_sign = 1 these are the tiles with no other tile both
+    left of and below them (the south-west staircase); the signs flip the
+    direction on each axis.
+    """
+    ordered = sorted(tiles, key=lambda t: (x_sign * t[0], y_sign * t[1]))
+    stairs = []
+    for x, y in ordered:
+        if not stairs or y_sign * y < y_sign * stairs[-1][1]:
+            stairs.append((x, y))
+    return stairs
+
+
+def part1(data, prefilter=True):
+    """Find largest rectangle using two red tiles as opposite corners.
+    
+    With the pre-filter, only pairs across opposite staircases are tried.
+    If a corner of the best rectangle were dominated by another tile on its
+    own side, swapping that tile in could only grow the rectangle. So the
+    best pair is south-west x north-east or north-west x south-east.
+    """
     tiles = parse_input(data)
     
+    if prefilter:
+        candidate_pairs = [
+            (staircase(tiles, 1, 1), staircase(tiles, -1, -1)),
+            (staircase(tiles, 1, -1), staircase(tiles, -1, 1)),
+        ]
+    else:
+        candidate_pairs = [(tiles, tiles)]
+    
     max_area = 0
     
     # Try all pairs of tiles as opposite corners
-    for i in range(len(tiles)):
-        for j in range(i + 1, len(tiles)):
-            area = calculate_area(tiles[i], tiles[j])
-            max_area = max(max_area, area)
+    for corners, opposite in candidate_pairs:
+        for p1 in corners:
+            for p2 in opposite:
+                area = calculate_area(p1, p2)
+                max_area = max(max_area, area)
     
     return max_area
 
 
+def pairs_by_area(tiles, block_size=32):
+    """Yield every pair of tiles as (area, i, j), largest area first.
+    
+    Pairs are generated lazily. The partners j > i of each tile are split
+    into blocks of consecutive tiles, and a heap holds every block with an
+    upper bound on its areas: the area to the farthest corner of the block's
+    bounding box. Consecutive tiles trace the polygon outline, so the boxes
+    are small and the bounds tight. A block's areas are only computed and
+    sorted once its bound reaches the top of the heap, so a caller that stops
+    early never pays for the blocks it does not reach. Ties come out in the
+    same order as sorting all pairs in reverse.
+    """
+    n = len(tiles)
+    xs = [x for x, _ in tiles]
+    ys = [y for _, y in tiles]
+    boxes = [
+        (min(xs[lo:lo + block_size]), max(xs[lo:lo + block_size]),
+         min(ys[lo:lo + block_size]), max(ys[lo:lo + block_size]))
+        for lo in range(0, n, block_size)
+    ]
+    
+    # Entries are (-area, -i, -j, row). An unexpanded block of row i starting
+    # at lo is stored with j = n + lo, so it pops before any real pair of the
+    # same area from that row, and its row field is the end of the block.
+    heap = []
+    for i in range(n - 1):
+        x, y = tiles[i]
+        lo = i + 1
+        while lo < n:
+            block = lo // block_size
+            hi = min((block + 1) * block_size, n)
+            min_x, max_x, min_y, max_y = boxes[block]
+            bound = (max(x - min_x, max_x - x) + 1) * (max(y - min_y, max_y - y) + 1)
+            heap.append((-bound, -i, -n - lo, hi))
+            lo = hi
+    heapq.heapify(heap)
+    
+    while heap:
+        neg_area, neg_i, neg_j, row = heapq.heappop(heap)
+        i = -neg_i
+        if neg_j <= -n:
+            # Partners packed as area * n + j, so a plain int sort orders them
+            # by area and then j, and the best one is popped off the end
+            x, y = tiles[i]
+            row = sorted([
+                (abs(x - xs[j]) + 1) * (abs(y - ys[j]) + 1) * n + j
+                for j in range(-neg_j - n, row)
+            ])
+        else:
+            yield -neg_area, i, -neg_j
+        if row:
+            area, j = divmod(row.pop(), n)
+            heapq.heappush(heap, (-area, neg_i, -j, row))
+
 
 def get_polygon_edges(tiles):
     """Get all edges of the polygon formed by connecting consecutive red tiles."""
@@ -186,10 +275,414 @@ def rectangle_inside_polygon(min_x, min_y, max_x, max_y, edges):
     return True
 
 
-def part2(data):
-    """Find largest rectangle using only red and green tiles."""
+class StabbingTree:
+    """Static segment tree of open intervals (lo, hi), each carrying a key.
+    
+    The interval endpoints are compressed to the distinct values plus the
+    gaps between them. Each interval is stored, through its key, in the
+    O(log n) canonical nodes that cover it, and every node keeps its keys
+    sorted. The intervals containing a point are then spread over the
+    nodes on one leaf-to-root path, and key questions are bisects.
+    """
+    
+    def __init__(self, intervals):
+        self.coords = sorted({v for lo, hi, _ in intervals for v in (lo, hi)})
+        size = 1
+        while size < 2 * len(self.coords) + 1:
+            size *= 2
+        self.size = size
+        self.nodes = [[] for _ in range(2 * size)]
+        
+        for lo, hi, key in intervals:
+            # Open (lo, hi) covers compressed indices from just after lo up to just before hi
+            left = self.compress(lo) + 1 + size
+            right = self.compress(hi) + size
+            while left < right:
+                if left & 1:
+                    self.nodes[left].append(key)
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    self.nodes[right].append(key)
+                left //= 2
+                right //= 2
+        
+        for node in self.nodes:
+            node.sort()
+    
+    def compress(self, value):
+        """Compressed index: 2k + 1 for the k-th coordinate, even indices for gaps."""
+        k = bisect_left(self.coords, value)
+        if k < len(self.coords) and self.coords[k] == value:
+            return 2 * k + 1
+        return 2 * k
+    
+    def stabbing_nodes(self, point):
+        """Yield the sorted key lists of every node on the path above a point."""
+        idx = self.compress(point) + self.size
+        while idx:
+            if self.nodes[idx]:
+                yield self.nodes[idx]
+            idx //= 2
+    
+    def count_greater(self, point, key):
+        """Count intervals strictly containing point whose key is greater than key."""
+        return sum(len(keys) - bisect_right(keys, key) for keys in self.stabbing_nodes(point))
+    
+    def any_between(self, point, low, high):
+        """Check for an interval strictly containing point with low < key < high."""
+        return any(
+            bisect_right(keys, low) < bisect_left(keys, high)
+            for keys in self.stabbing_nodes(point)
+        )
+
+
+class PolygonIndex:
+    """Polygon edges indexed once for fast point and segment queries.
+    
+    Vertical and horizontal edges are kept apart. Each has merged closed
+    spans per fixed coordinate for on-boundary tests, a StabbingTree over
+    open spans for ray casting and crossing tests, and a list sorted by the
+    fixed coordinate for rectangle-interior tests. Every query returns the
+    same answer as the matching module-level function, but costs
+    logarithmic time (plus output size) instead of a scan of all edges.
+    """
+    
+    def __init__(self, edges):
+        vertical = []  # (x, y_lo, y_hi), includes zero-length edges like the scans do
+        horizontal = []  # (y, x_lo, x_hi)
+        for (x1, y1), (x2, y2) in edges:
+            if x1 == x2:
+                vertical.append((x1, min(y1, y2), max(y1, y2)))
+            else:
+                horizontal.append((y1, min(x1, x2), max(x1, x2)))
+        vertical.sort()
+        horizontal.sort()
+        
+        self.vertical = vertical
+        self.vertical_x = [x for x, _, _ in vertical]
+        self.horizontal = horizontal
+        self.horizontal_y = [y for y, _, _ in horizontal]
+        
+        self.vertical_spans = self.merge_spans(vertical)
+        self.horizontal_spans = self.merge_spans(horizontal)
+        
+        # Vertical edges by their open y-span, keyed by x (and the reverse for horizontal)
+        self.vertical_tree = StabbingTree([(lo, hi, x) for x, lo, hi in vertical])
+        self.horizontal_tree = StabbingTree([(lo, hi, y) for y, lo, hi in horizontal])
+        
+        # x of every vertical edge end, by y, for rays that touch an endpoint
+        self.endpoint_x = defaultdict(list)
+        for x, lo, hi in vertical:
+            self.endpoint_x[lo].append(x)
+            if hi != lo:
+                self.endpoint_x[hi].append(x)
+        for xs in self.endpoint_x.values():
+            xs.sort()
+    
+    @staticmethod
+    def merge_spans(edges):
+        """Group closed spans by fixed coordinate and merge the overlapping ones."""
+        spans = defaultdict(list)
+        for fixed, lo, hi in edges:
+            merged = spans[fixed]
+            if merged and lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        return {fixed: ([lo for lo, _ in merged], [hi for _, hi in merged]) for fixed, merged in spans.items()}
+    
+    @staticmethod
+    def in_spans(spans, fixed, value):
+        """Check whether value lies in one of the merged spans at a fixed coordinate."""
+        if fixed not in spans:
+            return False
+        los, his = spans[fixed]
+        k = bisect_right(los, value) - 1
+        return k >= 0 and value <= his[k]
+    
+    def point_on_boundary(self, px, py):
+        """Indexed point_on_boundary."""
+        return self.in_spans(self.vertical_spans, px, py) or self.in_spans(self.horizontal_spans, py, px)
+    
+    def point_inside_polygon(self, px, py):
+        """Indexed point_inside_polygon, with the same half-crossing rule for endpoints."""
+        crossings = self.vertical_tree.count_greater(py, px)
+        xs = self.endpoint_x.get(py, ())
+        touches = len(xs) - bisect_right(xs, px)
+        # crossings + touches / 2 must be an odd whole number
+        return (2 * crossings + touches) % 4 == 2
+    
+    def point_inside_or_on_boundary(self, px, py):
+        """Indexed point_inside_or_on_boundary."""
+        if self.point_on_boundary(px, py):
+            return True
+        return self.point_inside_polygon(px, py)
+    
+    def segment_inside_polygon(self, x1, y1, x2, y2):
+        """Indexed segment_inside_polygon."""
+        if not self.point_inside_or_on_boundary(x1, y1):
+            return False
+        if not self.point_inside_or_on_boundary(x2, y2):
+            return False
+        
+        if x1 == x2:  # Vertical segment, look for horizontal edges crossing it
+            return not self.horizontal_tree.any_between(x1, min(y1, y2), max(y1, y2))
+        # Horizontal segment, look for vertical edges crossing it
+        return not self.vertical_tree.any_between(y1, min(x1, x2), max(x1, x2))
+    
+    def rectangle_inside_polygon(self, min_x, min_y, max_x, max_y):
+        """Indexed rectangle_inside_polygon."""
+        corners = [(min_x, min_y), (min_x, max_y), (max_x, min_y), (max_x, max_y)]
+        for cx, cy in corners:
+            if not self.point_inside_or_on_boundary(cx, cy):
+                return False
+        
+        if not self.segment_inside_polygon(min_x, max_y, max_x, max_y):
+            return False
+        if not self.segment_inside_polygon(min_x, min_y, max_x, min_y):
+            return False
+        if not self.segment_inside_polygon(min_x, min_y, min_x, max_y):
+            return False
+        if not self.segment_inside_polygon(max_x, min_y, max_x, max_y):
+            return False
+        
+        # No edge strictly between the sides may overlap the rectangle interior
+        start = bisect_right(self.vertical_x, min_x)
+        stop = bisect_left(self.vertical_x, max_x)
+        for _, lo, hi in self.vertical[start:stop]:
+            if lo < max_y and hi > min_y:
+                return False
+        start = bisect_right(self.horizontal_y, min_y)
+        stop = bisect_left(self.horizontal_y, max_y)
+        for _, lo, hi in self.horizontal[start:stop]:
+            if lo < max_x and hi > min_x:
+                return False
+        
+        return True
+
+
+class CompressedPolygon:
+    """The polygon rasterised once onto a coordinate-compressed grid.
+    
+    Only the distinct tile x and y values matter, so each axis is compressed
+    to those values plus the open gaps between them (and a one-cell border
+    of padding). Every compressed cell is then entirely inside or entirely
+    outside the polygon. Outside cells are found with a flood fill from the
+    border, and a 2-D prefix sum over them lets any rectangle be validated
+    in O(1).
+    """
+    
+    def __init__(self, tiles):
+        xs = sorted({x for x, _ in tiles})
+        ys = sorted({y for _, y in tiles})
+        # Value k sits at 2k + 1; gaps sit at even indices; 0 and the end are padding
+        self.x_index = {x: 2 * i + 1 for i, x in enumerate(xs)}
+        self.y_index = {y: 2 * i + 1 for i, y in enumerate(ys)}
+        self.width = 2 * len(xs) + 1
+        self.height = 2 * len(ys) + 1
+        
+        # A gap between neighbouring values like 7 and 8 holds no tiles at all,
+        # so being outside there must not count against a rectangle
+        self.x_has_tiles = self.tile_columns(xs)
+        self.y_has_tiles = self.tile_columns(ys)
+        
+        outside = self.flood_outside(tiles)
+        self.prefix = self.build_prefix(outside)
+    
+    @staticmethod
+    def tile_columns(values):
+        """Flag which compressed indices along one axis contain whole tiles."""
+        flags = [0] * (2 * len(values) + 1)
+        for i, value in enumerate(values):
+            flags[2 * i + 1] = 1
+            if i + 1 < len(values) and values[i + 1] - value > 1:
+                flags[2 * i + 2] = 1
+        return flags
+    
+    def flood_outside(self, tiles):
+        """Return a bytearray marking compressed cells outside the polygon."""
+        width, height = self.width, self.height
+        blocked = bytearray(width * height)
+        
+        # Rasterise the boundary
+        for (x1, y1), (x2, y2) in get_polygon_edges(tiles):
+            cx1, cx2 = sorted((self.x_index[x1], self.x_index[x2]))
+            cy1, cy2 = sorted((self.y_index[y1], self.y_index[y2]))
+            for cy in range(cy1, cy2 + 1):
+                row = cy * width
+                blocked[row + cx1:row + cx2 + 1] = b'\x01' * (cx2 - cx1 + 1)
+        
+        # Flood fill from the padding corner; anything it reaches is outside
+        outside = bytearray(width * height)
+        outside[0] = 1
+        stack = [0]
+        while stack:
+            cell = stack.pop()
+            cy, cx = divmod(cell, width)
+            for neighbour, ok in (
+                (cell - 1, cx > 0), (cell + 1, cx < width - 1),
+                (cell - width, cy > 0), (cell + width, cy < height - 1),
+            ):
+                if ok and not outside[neighbour] and not blocked[neighbour]:
+                    outside[neighbour] = 1
+                    stack.append(neighbour)
+        return outside
+    
+    def build_prefix(self, outside):
+        """2-D prefix sum of outside cells that contain tiles.
+        
+        prefix[(cy + 1) * (width + 1) + cx + 1] covers every cell up to (cx, cy).
+        """
+        width, height = self.width, self.height
+        x_has_tiles = self.x_has_tiles
+        stride = width + 1
+        prefix = [0] * (stride * (height + 1))
+        for cy in range(height):
+            running = 0
+            above = cy * stride
+            here = above + stride
+            row = cy * width
+            if not self.y_has_tiles[cy]:
+                prefix[here:here + stride] = prefix[above:above + stride]
+                continue
+            for cx in range(width):
+                running += outside[row + cx] & x_has_tiles[cx]
+                prefix[here + cx + 1] = prefix[above + cx + 1] + running
+        return prefix
+    
+    def rectangle_inside(self, min_x, min_y, max_x, max_y):
+        """Check, in O(1), that a rectangle with red corners has no outside cells."""
+        cx1, cx2 = self.x_index[min_x], self.x_index[max_x] + 1
+        cy1, cy2 = self.y_index[min_y], self.y_index[max_y] + 1
+        stride = self.width + 1
+        prefix = self.prefix
+        outside = (
+            prefix[cy2 * stride + cx2] - prefix[cy1 * stride + cx2]
+            - prefix[cy2 * stride + cx1] + prefix[cy1 * stride + cx1]
+        )
+        return outside == 0
+
+
+def make_inside_check(tiles, engine):
+    """Build the geometry for an engine and return its rectangle check."""
+    if engine == 'prefix':
+        return CompressedPolygon(tiles).rectangle_inside
+    if engine == 'indexed':
+        return PolygonIndex(get_polygon_edges(tiles)).rectangle_inside_polygon
+    if engine == 'exact':
+        edges = get_polygon_edges(tiles)
+        
+        def inside(min_x, min_y, max_x, max_y):
+            return rectangle_inside_polygon(min_x, min_y, max_x, max_y, edges)
+        return inside
+    raise ValueError(f"Unknown engine: {engine}")
+
+
+# Read-only geometry and the shared best area for pool workers. They are set
+# before the pool starts, so forked workers inherit them without any pickling;
+# under spawn they are sent once per worker through the pool initializer.
+SHARED = {}
+
+
+def init_search_worker(tiles, engine, best, best_lock):
+    """Pool initializer: make the geometry and shared best area available."""
+    if SHARED.get('tiles') is not tiles:
+        SHARED['tiles'] = tiles
+        SHARED['inside'] = make_inside_check(tiles, engine)
+    SHARED['best'] = best
+    SHARED['best_lock'] = best_lock
+
+
+def search_rows(rows):
+    """Worker: best valid area over pairs (i, j > i) for the rows i in [start, stop).
+    
+    Candidates no larger than the best area any worker has found so far are
+    skipped before the (expensive) inside check.
+    """
+    start, stop = rows
+    tiles = SHARED['tiles']
+    inside = SHARED['inside']
+    best = SHARED['best']
+    
+    local_best = 0
+    for i in range(start, stop):
+        x1, y1 = tiles[i]
+        for j in range(i + 1, len(tiles)):
+            x2, y2 = tiles[j]
+            area = (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1)
+            if area <= local_best or area <= best.value:
+                continue
+            if inside(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)):
+                local_best = area
+                with SHARED['best_lock']:
+                    if area > best.value:
+                        best.value = area
+    return local_best
+
+
+def balanced_row_chunks(n, num_chunks):
+    """Split rows 0..n-1 of the pair triangle into chunks with similar pair counts."""
+    total = n * (n - 1) // 2
+    target = max(1, -(-total // max(1, num_chunks)))
+    chunks = []
+    start = 0
+    pairs = 0
+    for i in range(n):
+        pairs += n - 1 - i
+        if pairs >= target:
+            chunks.append((start, i + 1))
+            start = i + 1
+            pairs = 0
+    if start < n:
+        chunks.append((start, n))
+    return chunks
+
+
+def part2_parallel(tiles, engine='prefix', workers=None, chunks_per_worker=4):
+    """Search all pairs across a process pool, sharing the best area for pruning."""
+    workers = workers or multiprocessing.cpu_count()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    
+    best = context.RawValue('q', 0)
+    best_lock = context.Lock()
+    # Build the geometry here so that forked workers simply inherit it
+    init_search_worker(tiles, engine, best, best_lock)
+    
+    chunks = balanced_row_chunks(len(tiles), workers * chunks_per_worker)
+    with context.Pool(workers, init_search_worker, (tiles, engine, best, best_lock)) as pool:
+        results = pool.map(search_rows, chunks, chunksize=1)
+    return max(results, default=0)
+
+
+def part2(data, engine='prefix', ordered=True, max_candidates=None, workers=None):
+    """Find largest rectangle using only red and green tiles.
+    
+    In ordered mode the candidates are checked largest first, so the search
+    stops at the first one that fits inside. ``max_candidates`` bounds how
+    many are checked; if none of them fits, None is returned. Passing
+    ``workers`` runs an exhaustive search across that many processes instead.
+    It finds the same largest area, so ``ordered`` makes no difference there,
+    but it cannot honour ``max_candidates``, and passing both is an error.
+    """
     tiles = parse_input(data)
-    edges = get_polygon_edges(tiles)
+    
+    if workers is not None:
+        if max_candidates is not None:
+            raise ValueError("max_candidates cannot be combined with workers")
+        return part2_parallel(tiles, engine, workers)
+    
+    inside = make_inside_check(tiles, engine)
+    
+    if ordered:
+        for checked, (area, i, j) in enumerate(pairs_by_area(tiles)):
+            if max_candidates is not None and checked >= max_candidates:
+                return None
+            (x1, y1), (x2, y2) = tiles[i], tiles[j]
+            if inside(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)):
+                return area
+        return 0
     
     max_area = 0
     
@@ -202,7 +695,7 @@ def part2(data):
             min_x, max_x = min(x1, x2), max(x1, x2)
             min_y, max_y = min(y1, y2), max(y1, y2)
             
-            if rectangle_inside_polygon(min_x, min_y, max_x, max_y, edges):
+            if inside(min_x, min_y, max_x, max_y):
                 area = calculate_area(tiles[i], tiles[j])
                 max_area = max(max_area, area)
     
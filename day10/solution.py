@@ -3,8 +3,18 @@
 Advent of Code 2025 - Day 10: Factory
 """
 import re
-from scipy.optimize import milp, LinearConstraint, Bounds
-import numpy as np
+import sqlite3
+import statistics
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from math import lcm
+
+try:
+    import numpy as np
+except ImportError:  # numpy and scipy are only needed by the 'milp' engine
+    np = None
 
 def read_input(filename='input.txt'):
     """Read and return the input file."""
@@ -32,6 +42,78 @@ def parse_machine(line):
     return target_lights, buttons, target_joltage
 
 
+# A parsed machine in solver-ready form. Bit i of light_mask and of each
+# button mask is light i; buttons keeps the wirings as index lists. incidence
+# (counters x buttons, 0/1) and target are numpy arrays, or None when skipped.
+Machine = namedtuple(
+    'Machine',
+    ['n_lights', 'light_mask', 'button_masks', 'buttons', 'joltage', 'incidence', 'target'],
+)
+
+LIGHT_BITS = bytes.maketrans(b'.#', b'01')
+
+# Largest free-button search box (product of the free buttons' ranges) that
+# solve_joltage_exact enumerates itself before falling back to milp
+EXACT_MAX_BOX = 10 ** 6
+
+
+def parse_machine_fast(line, incidence=True):
+    """
+    Parse a machine specification in one pass over its tokens, without regexes.
+    
+    Accepts bytes or str. Each whitespace-separated token is classified by
+    its opening bracket: the light pattern becomes a bitmask directly, every
+    button both an index list and a bitmask, and the joltage a list. With
+    `incidence` (and numpy installed) the dense incidence matrix and target
+    vector for the MILP solvers are built as well.
+    """
+    if isinstance(line, str):
+        line = line.encode()
+    
+    n_lights = light_mask = 0
+    buttons = []
+    button_masks = []
+    joltage = []
+    for token in line.split():
+        kind = token[0]
+        body = token[1:-1]
+        if kind == ord('('):
+            button = [int(value) for value in body.split(b',')]
+            buttons.append(button)
+            mask = 0
+            for idx in button:
+                mask |= 1 << idx
+            button_masks.append(mask)
+        elif kind == ord('['):
+            n_lights = len(body)
+            # Reverse so that light 0 ends up as the least significant bit
+            light_mask = int(body.translate(LIGHT_BITS)[::-1], 2) if body else 0
+        elif kind == ord('{'):
+            joltage = [int(value) for value in body.split(b',')]
+    
+    matrix = target = None
+    if incidence and np is not None:
+        matrix = np.zeros((len(joltage), len(buttons)), dtype=np.int64)
+        for j, button in enumerate(buttons):
+            matrix[button, j] = 1
+        target = np.array(joltage, dtype=np.int64)
+    
+    return Machine(n_lights, light_mask, button_masks, buttons, joltage, matrix, target)
+
+
+def parse_machines(data, incidence=False):
+    """Parse every machine in the input text."""
+    return [parse_machine_fast(line, incidence) for line in data.split('\n') if line.strip()]
+
+
+def iter_machines(filename, incidence=True):
+    """Yield machines from a file one at a time, reading it lazily line by line."""
+    with open(filename, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield parse_machine_fast(line, incidence)
+
+
 def solve_machine(target, buttons):
     """
     Solve a machine configuration using Gaussian elimination over GF(2).
@@ -113,33 +195,118 @@ def solve_machine(target, buttons):
     return min_presses if min_presses != float('inf') else None
 
 
-def part1(data):
+def solve_machine_bitmask(target_mask, button_masks, n_lights):
+    """
+    Solve a machine over GF(2) with every row stored as an int bitmask.
+    Returns the minimum number of button presses needed, or None.
+    
+    Each row (one per light) has a bit per button plus the target bit, so
+    eliminating a pivot XORs whole rows at once. The solutions are a
+    particular solution XOR any combination of the null-space vectors (one
+    per free button). Those combinations are walked in Gray-code order, so
+    every step flips a single null-space vector and the press count is
+    updated incrementally instead of re-running back substitution.
+    """
+    n_buttons = len(button_masks)
+    target_bit = 1 << n_buttons
+    
+    rows = []
+    for i in range(n_lights):
+        row = target_bit if (target_mask >> i) & 1 else 0
+        for j, mask in enumerate(button_masks):
+            if (mask >> i) & 1:
+                row |= 1 << j
+        rows.append(row)
+    
+    # Gauss-Jordan elimination: pivots[k] is the column of the pivot in rows[k]
+    pivots = []
+    for col in range(n_buttons):
+        bit = 1 << col
+        for r in range(len(pivots), n_lights):
+            if rows[r] & bit:
+                k = len(pivots)
+                rows[k], rows[r] = rows[r], rows[k]
+                for other in range(n_lights):
+                    if other != k and rows[other] & bit:
+                        rows[other] ^= rows[k]
+                pivots.append(col)
+                break
+    
+    # A leftover row reading 0 = 1 means the system is inconsistent
+    for r in range(len(pivots), n_lights):
+        if rows[r] & target_bit:
+            return None
+    
+    # Particular solution with all free buttons unpressed
+    solution = 0
+    for k, col in enumerate(pivots):
+        if rows[k] & target_bit:
+            solution |= 1 << col
+    
+    # One null-space vector per free button: press it and fix up the pivots
+    pivot_set = set(pivots)
+    null_space = []
+    for col in range(n_buttons):
+        if col in pivot_set:
+            continue
+        vector = 1 << col
+        for k, pivot in enumerate(pivots):
+            if rows[k] >> col & 1:
+                vector |= 1 << pivot
+        null_space.append(vector)
+    
+    vector_weights = [vector.bit_count() for vector in null_space]
+    presses = solution.bit_count()
+    min_presses = presses
+    for step in range(1, 1 << len(null_space)):
+        # Gray code: step k flips the vector at the position of k's lowest set bit
+        idx = (step & -step).bit_length() - 1
+        vector = null_space[idx]
+        presses += vector_weights[idx] - 2 * (solution & vector).bit_count()
+        solution ^= vector
+        if presses < min_presses:
+            min_presses = presses
+    
+    return min_presses
+
+
+def part1(data, engine='bitmask'):
     """Find minimum button presses for all machines."""
+    if engine == 'bitmask':
+        total = 0
+        for machine in parse_machines(data):
+            presses = solve_machine_bitmask(machine.light_mask, machine.button_masks, machine.n_lights)
+            if presses is not None:
+                total += presses
+        return total
+    
     lines = data.split('\n')
     total = 0
     
     for line in lines:
         if line.strip():
             target_lights, buttons, _ = parse_machine(line)
-            presses = solve_machine(target_lights, buttons)
+            if engine == 'matrix':
+                presses = solve_machine(target_lights, buttons)
+            else:
+                raise ValueError(f"Unknown engine: {engine}")
             if presses is not None:
                 total += presses
     
     return total
 
 
-def solve_joltage(target, buttons):
+def solve_joltage(incidence, target):
     """
     Solve joltage configuration using mixed-integer linear programming.
+    
+    `incidence` is the counters x buttons 0/1 matrix from parse_machine_fast,
+    where incidence[i][j] = 1 if button j affects counter i, and `target` the
+    joltage vector.
     """
-    n_counters = len(target)
-    n_buttons = len(buttons)
+    from scipy.optimize import milp, LinearConstraint, Bounds
     
-    # Build constraint matrix A where A[i][j] = 1 if button j affects counter i
-    A = np.zeros((n_counters, n_buttons))
-    for j, button in enumerate(buttons):
-        for counter_idx in button:
-            A[counter_idx][j] = 1
+    n_buttons = incidence.shape[1]
     
     b_lower = np.array(target, dtype=float)
     b_upper = np.array(target, dtype=float)
@@ -154,7 +321,7 @@ def solve_joltage(target, buttons):
     bounds = Bounds(lb=np.zeros(n_buttons), ub=np.inf)
     
     # Constraints: A @ x == b
-    constraints = LinearConstraint(A, lb=b_lower, ub=b_upper)
+    constraints = LinearConstraint(incidence, lb=b_lower, ub=b_upper)
     
     # Solve integer linear program
     result = milp(c, integrality=integrality, constraints=constraints, bounds=bounds)
@@ -166,27 +333,432 @@ def solve_joltage(target, buttons):
     return int(round(result.fun))
 
 
-def part2(data):
-    """Find minimum button presses for joltage configuration."""
-    lines = data.split('\n')
-    total = 0
+def joltage_incidence(target, buttons):
+    """Dense (incidence, target) numpy arrays for solve_joltage from index lists."""
+    incidence = np.zeros((len(target), len(buttons)), dtype=np.int64)
+    for j, button in enumerate(buttons):
+        incidence[list(button), j] = 1
+    return incidence, np.array(target, dtype=np.int64)
+
+
+def reduce_joltage_system(target, buttons):
+    """
+    Reduce A x = target to reduced row echelon form with exact rational arithmetic.
     
-    for line in lines:
-        if line.strip():
-            _, buttons, target_joltage = parse_machine(line)
-            presses = solve_joltage(target_joltage, buttons)
-            if presses is not None:
-                total += presses
+    Returns (pivot_rows, free_cols), or None if the system is inconsistent.
+    Each pivot row is (pivot_col, scale, rhs, coefs) with integers only,
+    meaning scale * x[pivot_col] = rhs - sum(coef * x[col] for col, coef in coefs)
+    over the free columns.
+    """
+    n_counters = len(target)
+    n_buttons = len(buttons)
+    
+    rows = []
+    for i in range(n_counters):
+        row = [Fraction(0)] * (n_buttons + 1)
+        for j, button in enumerate(buttons):
+            if i in button:
+                row[j] = Fraction(1)
+        row[n_buttons] = Fraction(target[i])
+        rows.append(row)
+    
+    pivots = []
+    for col in range(n_buttons):
+        k = len(pivots)
+        pivot = next((r for r in range(k, n_counters) if rows[r][col] != 0), None)
+        if pivot is None:
+            continue
+        rows[k], rows[pivot] = rows[pivot], rows[k]
+        lead = rows[k][col]
+        rows[k] = [value / lead for value in rows[k]]
+        for r in range(n_counters):
+            if r != k and rows[r][col] != 0:
+                factor = rows[r][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[k])]
+        pivots.append(col)
+    
+    for r in range(len(pivots), n_counters):
+        if rows[r][n_buttons] != 0:
+            return None
+    
+    pivot_set = set(pivots)
+    free_cols = [col for col in range(n_buttons) if col not in pivot_set]
+    
+    pivot_rows = []
+    for k, col in enumerate(pivots):
+        row = rows[k]
+        # Clear denominators so the search only ever handles integers
+        scale = lcm(*(value.denominator for value in row))
+        coefs = [(f, int(row[f] * scale)) for f in free_cols if row[f] != 0]
+        pivot_rows.append((col, scale, int(row[n_buttons] * scale), coefs))
+    return pivot_rows, free_cols
+
+
+def solve_joltage_exact(target, buttons, max_box=EXACT_MAX_BOX):
+    """
+    Solve joltage configuration exactly, without scipy or floating point.
+    
+    The system is reduced once with rational elimination, leaving every
+    pivot button as an affine function of the few free buttons. A
+    depth-first branch-and-bound then assigns the free buttons one by one:
+    - each free button is bounded by the smallest target it feeds;
+    - its range is cut further by the pivots that must stay non-negative;
+    - values are tried in the direction that lowers the total, stopping once
+      the optimistic total can no longer beat the best found;
+    - partial states (depth and remaining pivot right-hand sides) already
+      reached with no more presses are skipped.
+    
+    Buttons with identical wirings are merged first. If the free buttons
+    still span more than `max_box` assignments, the machine goes to the
+    milp solver instead (when numpy and scipy are available).
+    """
+    # Buttons with the same wiring cost the same and are interchangeable, so
+    # they collapse into one variable. Left in, each duplicate is a free
+    # button of weight zero, which the bound cannot prune at all.
+    buttons = [list(wiring) for wiring in dict.fromkeys(tuple(sorted(set(button))) for button in buttons)]
+    
+    reduced = reduce_joltage_system(target, buttons)
+    if reduced is None:
+        return None
+    pivot_rows, free_cols = reduced
+    
+    upper = {}
+    for f in free_cols:
+        fed = [target[i] for i in buttons[f]]
+        upper[f] = min(fed) if fed else 0
+    
+    box = 1
+    for f in free_cols:
+        box *= upper[f] + 1
+    if box > max_box and np is not None:
+        # Too many free assignments to enumerate safely, hand over to milp
+        try:
+            return solve_joltage(*joltage_incidence(target, buttons))
+        except ImportError:  # no scipy, so search the box after all
+            pass
+    
+    # Total presses = sum over pivots (rhs - coefs . x) / scale + sum of free x,
+    # tracked as exact fractions of each free button's weight
+    base = sum(Fraction(rhs, scale) for _, scale, rhs, _ in pivot_rows)
+    weight = {f: Fraction(1) for f in free_cols}
+    coef_of = []
+    for _, scale, _, coefs in pivot_rows:
+        coef_of.append(dict(coefs))
+        for f, coef in coefs:
+            weight[f] -= Fraction(coef, scale)
+    
+    depth_count = len(free_cols)
+    # Cheapest possible contribution of the free buttons from each depth on
+    min_rest = [Fraction(0)] * (depth_count + 1)
+    for d in range(depth_count - 1, -1, -1):
+        f = free_cols[d]
+        min_rest[d] = min_rest[d + 1] + min(0, weight[f] * upper[f])
+    # Most a pivot can still gain from later free buttons with negative coefficients
+    slack = [[0] * len(pivot_rows) for _ in range(depth_count + 1)]
+    for d in range(depth_count - 1, -1, -1):
+        f = free_cols[d]
+        for p, coefs in enumerate(coef_of):
+            slack[d][p] = slack[d + 1][p] + max(0, -coefs.get(f, 0)) * upper[f]
+    
+    best = None
+    seen = {}
+    
+    def search(depth, rhs, presses):
+        nonlocal best
+        if best is not None and presses + min_rest[depth] >= best:
+            return
+        key = (depth, rhs)
+        if key in seen and seen[key] <= presses:
+            return
+        seen[key] = presses
+        
+        if depth == depth_count:
+            for (_, scale, _, _), value in zip(pivot_rows, rhs):
+                if value < 0 or value % scale:
+                    return
+            best = presses if best is None else min(best, presses)
+            return
+        
+        f = free_cols[depth]
+        low, high = 0, upper[f]
+        for p, coefs in enumerate(coef_of):
+            coef = coefs.get(f, 0)
+            reach = rhs[p] + slack[depth + 1][p]
+            if coef > 0:
+                high = min(high, reach // coef)
+            elif coef < 0:
+                low = max(low, -(reach // -coef))
+        if low > high:
+            return
+        
+        values = range(low, high + 1) if weight[f] >= 0 else range(high, low - 1, -1)
+        for value in values:
+            step = presses + weight[f] * value
+            if best is not None and step + min_rest[depth + 1] >= best:
+                break
+            new_rhs = tuple(r - coefs.get(f, 0) * value for r, coefs in zip(rhs, coef_of))
+            search(depth + 1, new_rhs, step)
+    
+    search(0, tuple(rhs for _, _, rhs, _ in pivot_rows), base)
+    return None if best is None else int(best)
+
+
+def solve_joltage_batch(machines):
+    """
+    Solve many joltage machines with a single block-diagonal MILP.
+    
+    `machines` is a list of Machine tuples parsed with incidence. Every
+    machine's incidence matrix becomes one diagonal block of a sparse
+    constraint matrix. The blocks share no variables, so the optimum of the
+    combined model is optimal for each machine, and the per-machine totals
+    are split back out of the solution.
+    The relative MIP gap is set to zero, since a gap on the combined
+    objective could leave individual machines suboptimal. If the combined
+    model fails (e.g. one machine has no solution), the machines are solved
+    one by one. Returns a list of presses (None where unsolvable).
+    """
+    from scipy.optimize import milp, LinearConstraint, Bounds
+    from scipy.sparse import block_diag
+    
+    A = block_diag([machine.incidence for machine in machines], format='csr')
+    b = np.concatenate([machine.target for machine in machines]).astype(float)
+    n_vars = A.shape[1]
+    offsets = np.cumsum([0] + [machine.incidence.shape[1] for machine in machines])
+    
+    result = milp(
+        np.ones(n_vars),
+        integrality=np.ones(n_vars, dtype=int),
+        constraints=LinearConstraint(A, lb=b, ub=b),
+        bounds=Bounds(lb=np.zeros(n_vars), ub=np.inf),
+        options={'mip_rel_gap': 0},
+    )
+    if not result.success:
+        return [solve_joltage(machine.incidence, machine.target) for machine in machines]
+    
+    presses = np.round(result.x)
+    return [int(presses[start:stop].sum()) for start, stop in zip(offsets, offsets[1:])]
+
+
+def part2(data, engine='exact', batch_size=64):
+    """Find minimum button presses for joltage configuration.
+    
+    The 'milp_batch' engine solves `batch_size` machines per MILP call.
+    """
+    if engine not in ('exact', 'milp', 'milp_batch'):
+        raise ValueError(f"Unknown engine: {engine}")
+    
+    if engine == 'milp_batch':
+        machines = parse_machines(data, incidence=True)
+        total = 0
+        for start in range(0, len(machines), batch_size):
+            for presses in solve_joltage_batch(machines[start:start + batch_size]):
+                if presses is not None:
+                    total += presses
+        return total
+    
+    total = 0
+    for machine in parse_machines(data, incidence=(engine == 'milp')):
+        if engine == 'exact':
+            presses = solve_joltage_exact(machine.joltage, machine.buttons)
+        else:
+            presses = solve_joltage(machine.incidence, machine.target)
+        if presses is not None:
+            total += presses
     
     return total
 
 
+def canonical_lights_masks(n_lights, target_mask, button_masks):
+    """Canonical form of a part 1 machine: (n_lights, target mask, sorted button masks)."""
+    return ('lights', n_lights, target_mask, tuple(sorted(button_masks)))
+
+
+def canonical_joltage(target, buttons):
+    """Canonical form of a part 2 machine: targets plus sorted, de-duplicated button wirings."""
+    wirings = tuple(sorted({tuple(sorted(set(button))) for button in buttons}))
+    return ('joltage', tuple(target), wirings)
+
+
+def solve_canonical(key, engine='exact'):
+    """Worker: solve one canonical machine and time it. Returns (presses, seconds).
+    
+    `engine` picks the part 2 solver, as in part2 ('exact' or 'milp').
+    """
+    start = time.perf_counter()
+    if key[0] == 'lights':
+        _, n_lights, target_mask, button_masks = key
+        presses = solve_machine_bitmask(target_mask, list(button_masks), n_lights)
+    else:
+        _, target, wirings = key
+        if engine == 'exact':
+            presses = solve_joltage_exact(list(target), [list(w) for w in wirings])
+        elif engine == 'milp':
+            presses = solve_joltage(*joltage_incidence(target, wirings))
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+    return presses, time.perf_counter() - start
+
+
+class MachineBatch:
+    """Solve many machines at once, solving each distinct system only once.
+    
+    Machines are canonicalised so that identical systems share one key.
+    Keys are looked up in an in-memory LRU cache, then in an optional
+    on-disk SQLite store. The remaining unique systems are fanned out across
+    a process pool, solving part 2 machines with `engine`. Hit counts and
+    per-machine solve times are recorded for report().
+    """
+    
+    def __init__(self, cache_path=None, cache_size=4096, workers=None, engine='exact'):
+        if engine not in ('exact', 'milp'):
+            raise ValueError(f"Unknown engine: {engine}")
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.workers = workers
+        self.engine = engine
+        self.db = None
+        if cache_path is not None:
+            self.db = sqlite3.connect(cache_path)
+            self.db.execute('CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, presses INTEGER)')
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.lookups = 0
+        self.solve_times = []
+    
+    def remember(self, key, presses):
+        """Put a solution in the LRU cache, evicting the least recently used."""
+        self.cache[key] = presses
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+    
+    def lookup(self, key):
+        """Return (found, presses) from the memory cache or the disk store."""
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.memory_hits += 1
+            return True, self.cache[key]
+        if self.db is not None:
+            row = self.db.execute('SELECT presses FROM solutions WHERE key = ?', (repr(key),)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self.remember(key, row[0])
+                return True, row[0]
+        return False, None
+    
+    def solve(self, keys):
+        """Solve canonical machines, returning presses in the same order."""
+        results = {}
+        missing = {}  # insertion-ordered set of keys still to solve
+        for key in keys:
+            self.lookups += 1
+            if key in results or key in missing:
+                # Repeated within this batch
+                self.memory_hits += 1
+                continue
+            found, presses = self.lookup(key)
+            if found:
+                results[key] = presses
+            else:
+                missing[key] = None
+        
+        missing = list(missing)
+        engines = [self.engine] * len(missing)
+        if self.workers == 1 or len(missing) <= 1:
+            solved = list(map(solve_canonical, missing, engines))
+        else:
+            with ProcessPoolExecutor(self.workers) as pool:
+                solved = list(pool.map(solve_canonical, missing, engines, chunksize=max(1, len(missing) // 64)))
+        
+        for key, (presses, seconds) in zip(missing, solved):
+            results[key] = presses
+            self.solve_times.append(seconds)
+            self.remember(key, presses)
+            if self.db is not None:
+                self.db.execute('INSERT OR REPLACE INTO solutions VALUES (?, ?)', (repr(key), presses))
+        
+        if self.db is not None:
+            self.db.commit()
+        return [results[key] for key in keys]
+    
+    def report(self):
+        """Describe the cache hit rate and the distribution of solve times."""
+        hits = self.memory_hits + self.disk_hits
+        rate = hits / self.lookups if self.lookups else 0.0
+        lines = [
+            f"machines: {self.lookups}, solved: {len(self.solve_times)}, "
+            f"cache hits: {hits} ({rate:.1%}, {self.disk_hits} from disk)"
+        ]
+        if self.solve_times:
+            times = sorted(self.solve_times)
+            if len(times) > 1:
+                p50, p90, p99 = (statistics.quantiles(times, n=100, method='inclusive')[k] for k in (49, 89, 98))
+            else:
+                p50 = p90 = p99 = times[0]
+            lines.append(
+                "solve time: "
+                + ', '.join(
+                    f"{label} {seconds * 1_000:.3f}ms"
+                    for label, seconds in (('min', times[0]), ('p50', p50), ('p90', p90), ('p99', p99), ('max', times[-1]))
+                )
+            )
+        return '\n'.join(lines)
+    
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+def solve_batch(data, batch, part):
+    """Total presses for every machine in the input, solved through a MachineBatch."""
+    keys = []
+    for machine in parse_machines(data):
+        if part == 1:
+            keys.append(canonical_lights_masks(machine.n_lights, machine.light_mask, machine.button_masks))
+        else:
+            keys.append(canonical_joltage(machine.joltage, machine.buttons))
+    return sum(presses for presses in batch.solve(keys) if presses is not None)
+
+
+def solve_stream(filename):
+    """Solve both parts while streaming machines from a file. Returns (part1, part2)."""
+    total1 = total2 = 0
+    for machine in iter_machines(filename, incidence=False):
+        presses = solve_machine_bitmask(machine.light_mask, machine.button_masks, machine.n_lights)
+        if presses is not None:
+            total1 += presses
+        presses = solve_joltage_exact(machine.joltage, machine.buttons)
+        if presses is not None:
+            total2 += presses
+    return total1, total2
+
+
 def main():
     import sys
     # Read input
-    filename = sys.argv[1] if len(sys.argv) > 1 else 'input.txt'
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    filename = args[0] if args else 'input.txt'
+    
+    if '--stream' in flags:
+        # Never hold the whole machine list in memory
+        result1, result2 = solve_stream(filename)
+        print(f"Part 1: {result1}")
+        print(f"Part 2: {result2}")
+        return
+    
     data = read_input(filename)
     
+    if '--batch' in flags:
+        # Deduplicated, cached and parallel solving, with statistics
+        batch = MachineBatch(cache_path=args[1] if len(args) > 1 else None)
+        for part in (1, 2):
+            print(f"Part {part}: {solve_batch(data, batch, part)}")
+        print(batch.report())
+        batch.close()
+        return
+    
     # Solve parts
     result1 = part1(data)
     print(f"Part 1: {result1}")